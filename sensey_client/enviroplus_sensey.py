@@ -63,10 +63,10 @@ class BME280Sensor( EnvironmentSensor ):
         return ["temperature", "humidity", "pressure"]
     
     def poll(self)->SenseEvent:
-        temp = self.bm3280.get_temperature()
-        humidity = self.bm3280.get_humidity()
-        pres = self.bm3280.get_pressure()
-        return TempHumidityPressureEvent( temp, humidity, pres )
+        # get_temperature/get_humidity/get_pressure each re-read the whole data
+        # block over I2C; one update_sensor() fetches all three in one transaction
+        self.bm3280.update_sensor()
+        return TempHumidityPressureEvent( self.bm3280.temperature, self.bm3280.humidity, self.bm3280.pressure )
     
 class MICS6814GasSensor( EnvironmentSensor ):
     """ Polls the MICS6814 Analog gas sensor 
@@ -78,10 +78,10 @@ class MICS6814GasSensor( EnvironmentSensor ):
         return ["oxidising", "reducing", "nh3"]
     
     def poll(self)->SenseEvent:
-        oxidising = gas.read_oxidising()
-        reducing = gas.read_reducing()
-        nh3 = gas.read_nh3()
-        return AirQualityEvent( oxidising, reducing, nh3 )
+        # read_oxidising/read_reducing/read_nh3 each sample all three ADC
+        # channels; read_all() samples them once
+        readings = gas.read_all()
+        return AirQualityEvent( readings.oxidising, readings.reducing, readings.nh3 )
     
 
 async def main():
@@ -1,10 +1,11 @@
 import smbus
 import asyncio
 import logging
-from sensey import EnvironmentSensor, SenseEvent, CSVLogger
+from sensey import EnvironmentSensor, SenseEvent, CSVLogger, SensorReadError
 from dataclasses import dataclass
 #for moisture sensor
 import signal
+import struct
 import sys
 import time
 import spidev
@@ -79,26 +80,66 @@ class H2UT1DLightHumiditySensor( EnvironmentSensor ):
         self.CMD_READ_TEMP = 0xE3
         self.CMD_READ_HUM = 0xE5
         self.CMD_RESET = 0xFE
+        # Datasheet conversion: value = OFFSET + SCALE * raw, raw being the 16-bit reading
+        self._T_SCALE = 175.72 / 65536.0
+        self._T_OFFSET = -46.85
+        self._H_SCALE = 125.0 / 65536.0
+        self._H_OFFSET = -6.0
+        self.RESET_DELAY = 0.015  # Datasheet: soft reset takes up to 15 ms
         self.bus = smbus.SMBus(1)
+        # Reset once at startup; afterwards only on a CRC failure (see _read_raw)
+        self.reset()
+        time.sleep(self.RESET_DELAY)
 
     def reset(self):
        self.bus.write_byte( self.HTU21D_ADDR, self.CMD_RESET)
 
+    @staticmethod
+    def _crc8(msb:int, lsb:int) -> int:
+        """ CRC-8 over the two data bytes, polynomial x^8 + x^5 + x^4 + 1 (0x131) """
+        crc = 0
+        for byte in (msb, lsb):
+            crc ^= byte
+            for _ in range(8):
+                crc = (crc << 1) ^ 0x131 if crc & 0x80 else crc << 1
+        return crc
+
+    def _read_raw(self, command:int) -> int:
+        """ Reads a 16-bit measurement, resetting and retrying once on a CRC mismatch """
+        for _ in range(2):
+            data = bytes(self.bus.read_i2c_block_data(self.HTU21D_ADDR, command, 3))
+            if self._crc8(data[0], data[1]) == data[2]:
+                return struct.unpack_from(">H", data, 0)[0]
+            self.reset()
+            time.sleep(self.RESET_DELAY)
+        raise SensorReadError( f"HTU21D CRC mismatch reading command {command:#04x}" )
+
     @property
     def sensor_names(self):
         return["temperature", "humidity"]
     
     def poll(self)->SenseEvent:
-        self.reset()
-        msb, lsb, crc = self.bus.read_i2c_block_data(self.HTU21D_ADDR, self.CMD_READ_TEMP, 3)
-        temperature = -46.85 + 175.72 * (msb * 256 + lsb) / 65536
-        self.reset()
-        msb, lsb, crc = self.bus.read_i2c_block_data(self.HTU21D_ADDR, self.CMD_READ_HUM, 3)
-        humidity = -6 + 125 * (msb * 256 + lsb) / 65536.0
+        temperature = self._T_OFFSET + self._T_SCALE * self._read_raw(self.CMD_READ_TEMP)
+        humidity = self._H_OFFSET + self._H_SCALE * self._read_raw(self.CMD_READ_HUM)
         return TempHumidityEvent( temperature, humidity )
         
 
 class MoistureSensor( EnvironmentSensor):
+    """ Polls a soil moisture probe through an MCP3002 ADC on SPI0 CE0.
+
+    channel selects the ADC input (CH0/CH1) inside the SPI message; every
+    channel is read through the same SPI device.
+    """
+
+    # Pin 15 corresponds to GPIO 22
+    LED1 = 15
+    # Pin 16 corresponds to GPIO 23
+    LED2 = 16
+
+    # The MCP3002 sits on SPI bus 0, chip select CE0
+    SPI_BUS = 0
+    SPI_DEVICE = 0
+    SPI_MAX_SPEED_HZ = 1200000
 
     def __init__(self, channel:int = 0, dry_reading = 1023, wet_reading = 300 ):
 
@@ -108,16 +149,23 @@ class MoistureSensor( EnvironmentSensor):
 
         logging.info( f"setting up new MoistureSensor for channel {self.channel}" )
 
-        # Pin 15 corresponds to GPIO 22
-        self.LED1 = 15
-        # Pin 16 corresponds to GPIO 23
-        self.LED2 = 16
-
-        spi_ch = 0
+        # Construct SPI message once, it only depends on the channel
+        #  First bit (Start): Logic high (1)
+        #  Second bit (SGL/DIFF): 1 to select single mode
+        #  Third bit (ODD/SIGN): Select channel (0 or 1)
+        #  Fourth bit (MSFB): 0 for LSB first
+        #  Next 12 bits: 0 (don't care)
+        self._msg = [((0b11 << 1) + self.channel) << 5, 0b00000000]
 
         # Enable SPI
-        self.spi = spidev.SpiDev(0, spi_ch)
-        self.spi.max_speed_hz = 1200000
+        self.spi = spidev.SpiDev(self.SPI_BUS, self.SPI_DEVICE)
+        self.spi.max_speed_hz = self.SPI_MAX_SPEED_HZ
+
+        # One-time GPIO setup for the indicator LEDs (board pin numbering)
+        GPIO.setmode(GPIO.BOARD)
+        GPIO.setwarnings(False)
+        GPIO.setup(self.LED1, GPIO.OUT)
+        GPIO.setup(self.LED2, GPIO.OUT)
 
     def setLevels( self, dry:int, wet:int ):
         self.dry_reading = dry
@@ -127,44 +175,23 @@ class MoistureSensor( EnvironmentSensor):
     def sensor_names(self):
         return [f"soil_voltage", f"soil_moisture"]    
     
-    def light_up( self, seconds ):
-        # to use board pin numbers
-        GPIO.setmode(GPIO.BOARD)
-        GPIO.setwarnings(False)
-
-        # set up GPIO output channel for lights
-        GPIO.setup(self.LED1, GPIO.OUT)
-        GPIO.setup(self.LED2, GPIO.OUT)
-        
-        # light up the LEDs
+    async def light_up( self, seconds ):
+        # light up the LEDs without blocking the event loop
         GPIO.output( self.LED1, 1 )
         GPIO.output( self.LED2, 1 )
-        #FIXME this needs to be someplace with asyncio
-        time.sleep( 1 )
-        GPIO.reset()
+        await asyncio.sleep( seconds )
+        GPIO.output( self.LED1, 0 )
+        GPIO.output( self.LED2, 0 )
 
     
     def poll(self)->SenseEvent:
-        
-        # Construct SPI message
-        #  First bit (Start): Logic high (1)
-        #  Second bit (SGL/DIFF): 1 to select single mode
-        #  Third bit (ODD/SIGN): Select channel (0 or 1)
-        #  Fourth bit (MSFB): 0 for LSB first
-        #  Next 12 bits: 0 (don't care)
-        msg = 0b11
-        msg = ((msg << 1) + self.channel) << 5
-        msg = [msg, 0b00000000]
-        reply = self.spi.xfer2(msg)
 
-        # Construct single integer out of the reply (2 bytes)
-        adc = 0
-        for n in reply:
-            adc = (adc << 8) + n
+        reply = self.spi.xfer2(self._msg)
 
+        # Construct single integer out of the reply (2 bytes)
         # Last bit (0) is not part of ADC value, shift to remove it
-        adc = adc >> 1
-        #logging.info( f"Current adc reading is {adc}" )
+        adc = int.from_bytes(bytes(reply), "big") >> 1
+        #logging.info( "Current adc reading is %s", adc )
         
         # calculate moisture % from adc
         percentage = 100 * ((adc - self.dry_reading) / (self.wet_reading - self.dry_reading))
@@ -9,6 +9,7 @@ Key Components:
     - EnvironmentSensor: Abstract base class for sensor implementations
     - SenseEvent: Abstract base class for sensor reading events
     - CSVLogger: Async data logger with local caching and HTTP transmission
+    - SensorReadError: Raised by poll() when a reading fails validation
 
 Design Pattern:
     Uses a plugin architecture where new sensor types can be added by:
@@ -40,6 +41,7 @@ Usage Example:
 """
 
 import asyncio
+import atexit
 import csv
 import logging
 import requests
@@ -61,6 +63,14 @@ logging.basicConfig(
 )
 
 
+class SensorReadError(Exception):
+    """
+    Raised by EnvironmentSensor.poll() when a reading can't be trusted
+    (e.g. checksum mismatch). CSVLogger skips that sensor for the tick.
+    """
+    pass
+
+
 class SenseEvent(ABC):
     """Base class for events generated by EnvironmentSensor objects."""
 
@@ -78,6 +88,16 @@ class EnvironmentSensor(ABC):
         """Polls the sensor and returns a SenseEvent."""
         pass
 
+    async def poll_async(self) -> SenseEvent:
+        """
+        Polls the sensor without blocking the event loop.
+
+        The default implementation runs the blocking poll() in the loop's
+        default executor so several sensors can be read concurrently.
+        Sensors with native async I/O may override this.
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, self.poll)
+
     @property
     @abstractmethod
     def sensor_names(self) -> List[str]:
@@ -100,6 +120,11 @@ class CSVLogger:
     server is unreachable, data accumulates in the cache and is transmitted when
     connectivity is restored.
 
+    CSV Buffering:
+        Each tick appends its row to an in-memory batch. Every flush_interval
+        seconds (and at exit) the batch is written with a single writerows()
+        call to the local CSV file, which stays open with a 64 KiB buffer.
+
     Retry Strategy:
         - Starts with 1-second delay
         - Doubles on each failure (up to 8 seconds)
@@ -123,6 +148,7 @@ class CSVLogger:
         Configuration:
             Reads from sensey.ini in current directory. If [client] section exists:
             - poll_interval: Override default polling interval
+            - flush_interval: Seconds between CSV buffer flushes (default: 1.0)
             - cache_file: Path to persistent cache file
             - sensey_server: Server address (host:port format)
         """
@@ -138,6 +164,18 @@ class CSVLogger:
         self.host = gethostname()  # Client identifier (hostname)
         self.filename = self._generate_filename()  # Daily CSV file
         self.cache_file = "./sensey_cache.json"  # Persistent queue storage
+        self.flush_interval = 1.0  # Seconds between CSV buffer flushes
+
+        # CSV columns are fixed by the sensor set, so build them once
+        self.fieldnames = ["timestamp"] + [
+            name
+            for sensor in self.sensors
+            for name in sensor.sensor_names
+        ]
+        self._batch: List[List[Any]] = []  # Rows waiting for the next flush
+        self._csv_file = None  # Opened lazily on first flush, then kept open
+        self._csv_writer = None
+        self._csv_needs_header = False
 
         # Retry configuration for exponential backoff
         self.INITIAL_RETRY_DELAY = 1  # Start with 1 second
@@ -148,6 +186,7 @@ class CSVLogger:
             self.config = cfg["client"]
             self.interval = self.config.getint('poll_interval', 300)
             self.cache_file = self.config.get('cache_file', "./sensey_cache.json")
+            self.flush_interval = self.config.getfloat('flush_interval', 1.0)
             logging.info(f"Loaded config file with keys {[key for key in self.config.keys()]}")
 
         # Load any unsent data from previous runs
@@ -156,6 +195,9 @@ class CSVLogger:
         # Construct server endpoint URL with hostname as client ID
         self.server_url = f"http://{self.sensey_server}/data/{self.host}"
 
+        # Make sure buffered CSV rows reach disk on shutdown
+        atexit.register(self._close_csv)
+
     def _generate_filename(self) -> str:
         """Generates a weekly CSV filename based on the current date."""
 
@@ -186,12 +228,67 @@ class CSVLogger:
             logging.info( f"No cache file found at {self.cache_file}")
         return cache
     
+    def _open_csv(self):
+        """Open the local CSV file for buffered appends (kept open between ticks)."""
+        if self._csv_file is None:
+            self._csv_file = open(self.filename, mode='a', newline='', buffering=64 * 1024)
+            self._csv_writer = csv.writer(self._csv_file)
+            # Checked once at open time: tell() on a text file forces a flush
+            self._csv_needs_header = self._csv_file.tell() == 0
+        return self._csv_file
+
+    def _flush_csv(self):
+        """Write the pending batch of rows and flush the CSV file to disk."""
+        if self._batch:
+            try:
+                self._open_csv()
+
+                # Write the header if the file is empty
+                if self._csv_needs_header:
+                    self._csv_writer.writerow(self.fieldnames)
+                    self._csv_needs_header = False
+
+                self._csv_writer.writerows(self._batch)
+                self._batch.clear()
+            except OSError as e:
+                logging.error(f"Failed to write CSV rows to {self.filename}: {e}")
+                return
+
+        if self._csv_file is not None:
+            try:
+                self._csv_file.flush()
+            except OSError as e:
+                logging.error(f"Failed to flush CSV file {self.filename}: {e}")
+
+    def _close_csv(self):
+        """Write any pending rows, then flush and close the local CSV file."""
+        self._flush_csv()
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+            self._csv_writer = None
+
+    async def _periodic_flush(self):
+        """Write batched CSV rows every flush_interval seconds."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self._flush_csv()
+
     async def log_data(self):
         """Periodically sends data to a sensey_server and logs sensor data to a CSV file."""
+        flush_task = asyncio.create_task(self._periodic_flush())
+        try:
+            await self._log_loop()
+        finally:
+            flush_task.cancel()
+            self._close_csv()
+
+    async def _log_loop(self):
+        """Poll, log and send sensor data every interval seconds."""
         while True:
             try:
                 logging.info("Polling sensors for data...")
-                data = self._poll_sensors()
+                data = await self._poll_sensors()
                 self._write_to_csv(data)
                 logging.info("Data logged successfully.")
                 self._send_data( data )
@@ -200,45 +297,38 @@ class CSVLogger:
                 logging.error(f"Error logging data: {e}", exc_info=True)
             await asyncio.sleep(self.interval)
 
-    def _poll_sensors(self) -> Dict[str, Any]:
-        """Polls all sensors and collects their data."""
+    async def _poll_sensors(self) -> Dict[str, Any]:
+        """
+        Polls all sensors concurrently and collects their data.
+
+        Sensor I/O (I2C/SPI) is blocking, so each poll runs in an executor and
+        the tick takes as long as the slowest sensor rather than the sum of all.
+        A failing sensor is logged and skipped without affecting the others.
+        """
         consolidated_data = {"timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-        for sensor in self.sensors:
-            try:
-                event = sensor.poll()
-                logging.debug(f"Polled data from {type(sensor).__name__}: {event.reading()}")
-                consolidated_data.update(event.reading())
-            except Exception as e:
-                logging.warning(f"Failed to poll sensor {type(sensor).__name__}: {e}", exc_info=True)
+        events = await asyncio.gather(
+            *(sensor.poll_async() for sensor in self.sensors),
+            return_exceptions=True
+        )
+        for sensor, event in zip(self.sensors, events):
+            if isinstance(event, SensorReadError):
+                logging.warning(f"Discarded reading from {type(sensor).__name__}: {event}")
+                continue
+            if isinstance(event, Exception):
+                logging.warning(f"Failed to poll sensor {type(sensor).__name__}: {event}", exc_info=event)
+                continue
+            logging.debug(f"Polled data from {type(sensor).__name__}: {event.reading()}")
+            consolidated_data.update(event.reading())
 
         return consolidated_data
 
     def _write_to_csv(self, data: Dict[str, Any]):
-        """Writes consolidated sensor data to the CSV file."""
-        # Generate fieldnames dynamically based on sensor names
-        fieldnames = ["timestamp"] + [
-            name
-            for sensor in self.sensors
-            for name in sensor.sensor_names
-        ]
-
-        # Prepare the row to write, starting with the timestamp
-        row = {}
-        for field in fieldnames:  # don't Skip "timestamp"
-            value = data.get(field, None)
-            if isinstance(value, float):
-                value = round(value, self.decimal_places)
-            row[field] = value
-
-        # Write to the CSV file
-        with open(self.filename, mode='a', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-            # Write the header if the file is empty
-            if csvfile.tell() == 0:
-                writer.writeheader()
-
-            writer.writerow(row)
+        """Queues consolidated sensor data for the next CSV batch write (see _flush_csv)."""
+        decimal_places = self.decimal_places
+        self._batch.append([
+            round(value, decimal_places) if isinstance(value, float) else value
+            for value in map(data.get, self.fieldnames)
+        ])
 
     def _send_data(self, data: Dict[str, Any]):
         """
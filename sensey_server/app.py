@@ -13,13 +13,17 @@ Routes:
 Storage:
     The application uses a pluggable storage backend (CSV or MySQL) configured
     via sensey.ini. The storage is initialized at startup and cleanly closed
-    on shutdown.
+    on shutdown. create_app(config_path) builds the application; the module-level
+    `app` is created from the default configuration on import.
 
 Usage:
     # Development (with .venv activated)
     python app.py
 
-    # Production (via systemd)
+    # Production (gunicorn + gevent workers, see wsgi.py and gunicorn.conf.py)
+    gunicorn wsgi:application
+
+    # Production (via systemd, runs gunicorn)
     systemctl start sensey-server
 
 Configuration:
@@ -33,17 +37,51 @@ Environment Variables:
 
 __version__ = "0.3.0"  # Version: 0.3.0 - Ecowitt integration, podman deployment
 
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import numpy as np
 import os
+import signal
+import sys
+import time
 import atexit
-import configparser
-from flask import Flask, jsonify, request, render_template
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import chain
+from typing import Optional
+from flask import Flask, Response, current_app, jsonify, request, render_template, stream_template
+from flask.json.provider import DefaultJSONProvider, JSONProvider
 import logging
 import sensey_data  # Data handling module
+from fast import lttb_indices, minmax  # numba-compiled when available
+
+# Try to import orjson (optional, faster JSON encoding/decoding)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
-app = Flask(__name__)
+class OrjsonProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson, used for jsonify() and request.get_json().
+
+    Types orjson doesn't handle natively fall back to Flask's default encoder.
+    Plotly's to_json_plotly() picks orjson up on its own when it is installed.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(
+            obj,
+            default=DefaultJSONProvider.default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+# Disable debug in production for security
+DEBUG_MODE = os.environ.get('SENSEY_DEBUG', 'False').lower() == 'true'
 
 # Logging setup
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -59,75 +97,85 @@ def initialize_storage():
         storage = create_storage_from_config()
         storage.initialize()
         sensey_data.set_storage(storage)
+        sensey_data.start_background_flush()
 
         logger.info("Storage backend initialized successfully")
 
     except ConfigurationError as e:
-        logger.error(f"Configuration error: {e}")
+        logger.error("Configuration error: %s", e)
         logger.error("Application cannot start without valid configuration")
         raise
     except Exception as e:
-        logger.error(f"Failed to initialize storage: {e}")
+        logger.error("Failed to initialize storage: %s", e)
         raise
 
-# Initialize storage on application startup
-try:
-    initialize_storage()
-except Exception as e:
-    logger.critical(f"FATAL: Storage initialization failed: {e}")
-    logger.critical("Please check sensey.ini configuration and try again")
-    # Let the exception propagate - app should not start without storage
-    raise
-
-# Load full config for optional integrations
-# TODO: Refactor to use config.py module for all configuration
-config_parser = configparser.ConfigParser()
-config_parser.read('sensey.ini')
-
-# Get global system units setting (defaults to metric)
-system_units = config_parser.get('server', 'system_units', fallback='metric')
-logger.info(f"System units: {system_units}")
-
-# Conditionally load Ecowitt integration
-if 'ecowitt' in config_parser and config_parser['ecowitt'].getboolean('enabled', False):
-    logger.info("Loading Ecowitt integration...")
-    try:
-        from ecowitt import register_routes as register_ecowitt_routes
-        register_ecowitt_routes(app, config_parser['ecowitt'], system_units)
-        logger.info("Ecowitt integration enabled")
-    except Exception as e:
-        logger.error(f"Failed to load Ecowitt integration: {e}", exc_info=True)
-        raise
-else:
-    logger.info("Ecowitt integration disabled (set enabled=true in [ecowitt] section to enable)")
-
 # Register shutdown handler to close storage cleanly
 @atexit.register
 def shutdown_storage():
-    """Close storage backend on application shutdown."""
+    """
+    Close storage backend on application shutdown.
+
+    Flushes readings still queued for the background writer. Safe to call more
+    than once: under gunicorn the worker_exit hook (gunicorn.conf.py) calls it
+    while the worker is still alive, and atexit remains as a fallback.
+    """
     logger.info("Application shutting down, closing storage...")
     sensey_data.close_storage()
 
-@app.route("/data/<client_id>", methods=["POST"])
+def _exit_on_sigterm(signum, frame):
+    """Turn SIGTERM into a normal exit so atexit handlers (and the final flush) run."""
+    sys.exit(0)
+
 def receive_data(client_id):
     """Receive sensor data from a remote Raspberry Pi."""
+    if not sensey_data.is_valid_client_id(client_id):
+        return jsonify({"error": "Invalid client_id"}), 400
+
     try:
-        sensor_data = request.get_json()
+        sensor_data = request.get_json(silent=True)
         if not sensor_data:
             return jsonify({"error": "Invalid JSON"}), 400
+        if not isinstance(sensor_data, dict):
+            # Lists, strings and numbers are valid JSON but not a reading
+            return jsonify({"error": "Expected a JSON object"}), 400
 
-        logger.info(f"Received data from {client_id}: {sensor_data}")
+        # Payload only at DEBUG: at INFO and above the dict is never formatted
+        logger.debug("Received data from %s: %s", client_id, sensor_data)
 
-        # Save data using sensey_data
-        sensey_data.store_data(client_id, sensor_data)
+        # Queue for the background batch writer; storage I/O happens off-request
+        sensey_data.queue_data(client_id, sensor_data)
 
         return jsonify({"status": "success"}), 200
 
+    except ValueError as e:
+        # Malformed reading (e.g. unparseable timestamp), rejected before queuing
+        return jsonify({"error": f"Invalid reading: {e}"}), 400
     except Exception as e:
-        logger.error(f"Error processing data from {client_id}: {e}")
+        logger.error("Error processing data from %s: %s", client_id, e)
         return jsonify({"error": "Internal server error"}), 500
 
-@app.route("/health")
+# Client list shared by / and /health, refreshed at most every CLIENTS_CACHE_TTL seconds
+CLIENTS_CACHE_TTL = 5.0
+_clients_cache = (0.0, None)  # (expires_at, clients)
+
+def _cached_clients():
+    """
+    Return the available clients, reusing the last result for CLIENTS_CACHE_TTL seconds.
+
+    Health probes and dashboard loads can arrive several times per second, and
+    each get_available_clients() call is a directory scan (CSV) or a database
+    round-trip (MySQL). This is a deliberate staleness window: a new client can
+    take up to CLIENTS_CACHE_TTL seconds to appear. Failures are never cached.
+    """
+    global _clients_cache
+
+    expires_at, clients = _clients_cache
+    now = time.monotonic()
+    if clients is None or now >= expires_at:
+        clients = sensey_data.get_available_clients()
+        _clients_cache = (now + CLIENTS_CACHE_TTL, clients)
+    return clients
+
 def health():
     """
     Health check endpoint for container orchestration and monitoring.
@@ -138,30 +186,219 @@ def health():
     try:
         # Verify storage is accessible by checking for clients
         # This is a lightweight check that exercises the storage layer
-        _ = sensey_data.get_available_clients()
+        # (at most once per CLIENTS_CACHE_TTL seconds)
+        _ = _cached_clients()
         return jsonify({"status": "healthy", "storage": "accessible"}), 200
     except Exception as e:
-        logger.error(f"Health check failed: {e}")
+        logger.error("Health check failed: %s", e)
         return jsonify({"status": "unhealthy", "error": str(e)}), 503
 
-@app.route("/")
+# Last rendered dashboard page, keyed on the client list it was rendered for
+_index_cache = (None, None)  # (clients tuple, html)
+
 def index():
-    """Show a dropdown to select a client and display charts for the selected client."""
-    clients = sensey_data.get_available_clients()
+    """
+    Show a dropdown to select a client and display charts for the selected client.
+
+    The page only depends on the client list, so the rendered HTML is reused
+    until a client is added or removed.
+    """
+    global _index_cache
+
+    clients = _cached_clients()
 
     if not clients:
         return "<h2>No data available.</h2>"
 
-    # Default to first client if none is selected
-    return render_template("index.html", clients=clients, version=__version__, system_units=system_units)
+    key = tuple(clients)
+    cached_key, html = _index_cache
+    if key != cached_key:
+        # Default to first client if none is selected
+        html = render_template("index.html", clients=clients, version=__version__,
+                               system_units=current_app.config['SYSTEM_UNITS'])
+        _index_cache = (key, html)
+
+    return html
+
+# Upper bound on points per chart; denser series are downsampled with LTTB
+MAX_CHART_POINTS = 2000
+
+# Backends without a data version token get their charts cached per window of
+# this many seconds instead, so back-to-back page loads share a single read
+CHARTS_CACHE_TTL = 30.0
+
+@lru_cache(maxsize=1)
+def _chart_style():
+    """
+    Return the (color palette, base layout) shared by every chart, built once.
+
+    plotly is imported here rather than at module load, so workers that only
+    ingest data never pay its import time or memory. Figures are assembled as
+    plain dicts and serialized directly, skipping graph_objects construction
+    and validation; the named template is resolved to a dict because plotly.js
+    can't look templates up by name.
+    """
+    import plotly.io as pio
+    from plotly.colors import qualitative
+
+    base_layout = {
+        "template": pio.templates["plotly_dark"].to_plotly_json(),  # Dark theme
+        "height": 350,
+        "width": 500,
+        "font": {"family": "Arial, sans-serif", "size": 14},
+        "margin": {"l": 30, "r": 30, "t": 50, "b": 50},  # Compact margins
+        "xaxis": {"title": {"text": "Timestamp"}},
+    }
+    # Color palette for visual distinction between charts
+    return qualitative.Set2, base_layout
+
+def _generate_charts(client_id, time_range):
+    """
+    Build the charts for a client and time range, one at a time.
+
+    A generator, so the charts page can stream each chart to the browser as
+    soon as it is serialized instead of waiting for all of them.
+
+    Args:
+        client_id (str): Unique identifier for the client
+        time_range (str): Time range string (1h, 6h, 1d, 3d, 7d, all)
+
+    Yields:
+        Chart dicts ({'name', 'div_id', 'json'}); nothing if no data is available
+    """
+    # Fetch only the timestamp and numeric columns when the backend can name them;
+    # otherwise fetch everything and rely on select_dtypes() below
+    numeric_columns = sensey_data.get_numeric_columns(client_id)
+    columns = ['timestamp'] + numeric_columns if numeric_columns else None
+    df = sensey_data.get_latest_data(client_id, time_range, columns=columns)
+    if df is None or df.empty:
+        return
+
+    from plotly.io.json import to_json_plotly
+
+    # Generate one chart for each numeric column (temperature, humidity, etc.)
+    palette, base_layout = _chart_style()
+    n_colors = len(palette)
+
+    # Numeric columns (excluding timestamp), computed once for the whole loop
+    numeric_cols = [c for c in df.select_dtypes(include=['number']).columns if c != "timestamp"]
+    if not numeric_cols:
+        return
+
+    # Shared x-axis for every chart. Traces are built from plain numpy arrays:
+    # boolean/integer indexing on them is much cheaper than on pandas Series
+    # (no index alignment or copies), and they serialize straight to JSON lists
+    ts = df["timestamp"].to_numpy()
+
+    # Keep the payload and browser render time bounded for long/dense ranges
+    downsample = len(df) > MAX_CHART_POINTS
+    if downsample:
+        ts_seconds = (ts - ts[0]) / np.timedelta64(1, "s")
+
+    for i, column in enumerate(numeric_cols):
+        # Convert column name to human-readable format (e.g., "soil_moisture" -> "Soil Moisture")
+        display_name = column.replace("_", " ").title()
+
+        x, y = ts, df[column].to_numpy(dtype=float, na_value=np.nan)
+
+        # Calculate dynamic y-axis range with 25% padding above and below data range
+        # This prevents data points from touching the chart edges
+        y_min, y_max = minmax(y)  # One pass over the full, not downsampled, column
+        y_range_padding = (y_max - y_min) * 0.25 if y_max != y_min else y_max * 0.25
+        y_range = [y_min - y_range_padding, y_max + y_range_padding]
+
+        if downsample:
+            valid = ~np.isnan(y)
+            idx = lttb_indices(ts_seconds[valid], y[valid], MAX_CHART_POINTS)
+            x, y = x[valid][idx], y[valid][idx]
+
+        # Line chart with markers for data points
+        trace = {
+            "type": "scatter",
+            "x": x,
+            "y": y,
+            "mode": "lines+markers",  # Show both line and individual data points
+            "name": display_name,
+            "yhoverformat": ".2f",  # Values are stored at full precision
+            "line": {"color": palette[i % n_colors]},  # Cycle through color palette
+        }
+        layout = {
+            **base_layout,
+            "title": {"text": f"{display_name} Over Time"},
+            "yaxis": {"title": {"text": display_name}, "range": y_range},  # Apply calculated range
+        }
+
+        # Serialize the figure; the page renders it with the shared plotly.js
+        yield {
+            'name': display_name,
+            'div_id': f"chart-{column}",
+            'json': to_json_plotly({"data": [trace], "layout": layout})
+        }
+
+# Rendered charts per (client_id, time_range, data_version), least recently used first
+CHARTS_CACHE_SIZE = 64
+_charts_cache = OrderedDict()
+
+def _iter_charts(client_id, time_range, data_version):
+    """
+    Yield the charts for a client and time range, cached per data version.
+
+    The version token comes from the storage backend and changes on every
+    write for that client, so repeated page loads between sensor pushes skip
+    the storage read and all Plotly work. Relative windows (e.g. '1h') are
+    therefore anchored at the time of the last write, not of the page load.
+
+    On a miss the charts are yielded as they are generated and only cached
+    once all of them have been, so an aborted page load caches nothing.
+
+    Args:
+        client_id (str): Unique identifier for the client
+        time_range (str): Time range string (1h, 6h, 1d, 3d, 7d, all)
+        data_version: Hashable token from sensey_data.get_data_version()
+
+    Yields:
+        Chart dicts ({'name', 'div_id', 'json'}); nothing if no data is available
+    """
+    key = (client_id, time_range, data_version)
+    cached = _charts_cache.get(key)
+    if cached is not None:
+        _charts_cache[key] = _charts_cache.pop(key, cached)  # Mark most recently used
+        yield from cached
+        return
+
+    charts = []
+    for chart in _generate_charts(client_id, time_range):
+        charts.append(chart)
+        yield chart
+
+    _charts_cache[key] = tuple(charts)
+    while len(_charts_cache) > CHARTS_CACHE_SIZE:
+        _charts_cache.popitem(last=False)
+
+@lru_cache(maxsize=1)
+def _plotly_js():
+    """Return the plotly.js bundle shipped with the plotly package (read once)."""
+    from plotly.offline import get_plotlyjs
+    return get_plotlyjs()
+
+def plotly_js():
+    """
+    Serve plotly.js for the charts page.
+
+    Loaded once per page (and cached by the browser) instead of being inlined
+    into every chart. Served locally so dashboards keep working offline.
+    """
+    return Response(_plotly_js(), mimetype="application/javascript",
+                    headers={"Cache-Control": "public, max-age=604800"})
 
-@app.route("/charts/<client_id>")
 def display_charts_for_client(client_id):
     """
     Generate and display interactive charts for a specific client.
 
     Creates one Plotly chart for each numeric column in the client's sensor data.
     Charts are displayed in a responsive grid layout with time range filtering.
+    Rendered charts are cached per data version (see _iter_charts) and the
+    page is streamed, so each chart is sent as soon as it is ready.
 
     Args:
         client_id (str): Unique identifier for the client (typically hostname)
@@ -178,65 +415,115 @@ def display_charts_for_client(client_id):
         - Responsive sizing for different screen sizes
         - Unique colors for each measurement type
     """
+    if not sensey_data.is_valid_client_id(client_id):
+        return render_template("charts.html", client_id=client_id,
+                             error="Invalid client ID", time_range='3d'), 400
+
     # Get time range from query parameter (default: 3 days)
     time_range = request.args.get('range', '3d')
 
-    # Fetch sensor data from storage backend
-    df = sensey_data.get_latest_data(client_id, time_range)
-    if df is None or df.empty:
+    # Backends without a version token fall back to a time bucket, so their
+    # charts (and the DataFrame behind them) are at most CHARTS_CACHE_TTL stale
+    data_version = sensey_data.get_data_version(client_id)
+    if data_version is None:
+        data_version = ("ttl", int(time.monotonic() // CHARTS_CACHE_TTL))
+    charts = _iter_charts(client_id, time_range, data_version)
+
+    # Build the first chart up front so a client without data still gets a
+    # plain error page (and no plotly.js); the rest are streamed as they render
+    first_chart = next(charts, None)
+    if first_chart is None:
         return render_template("charts.html", client_id=client_id,
                              error="No data available", time_range=time_range)
 
-    # Generate one chart for each numeric column (temperature, humidity, etc.)
-    charts = []
-    colors = px.colors.qualitative.Set2  # Color palette for visual distinction
-
-    # Iterate through all numeric columns (excluding timestamp)
-    for i, column in enumerate(df.select_dtypes(include=['number']).columns):
-        if column != "timestamp":
-            # Convert column name to human-readable format (e.g., "soil_moisture" -> "Soil Moisture")
-            display_name = column.replace("_", " ").title()
-
-            # Calculate dynamic y-axis range with 25% padding above and below data range
-            # This prevents data points from touching the chart edges
-            y_min, y_max = df[column].min(), df[column].max()
-            y_range_padding = (y_max - y_min) * 0.25 if y_max != y_min else y_max * 0.25
-            y_range = [y_min - y_range_padding, y_max + y_range_padding]
-
-            # Create Plotly line chart with markers for data points
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=df["timestamp"],
-                y=df[column],
-                mode='lines+markers',  # Show both line and individual data points
-                name=display_name,
-                line=dict(color=colors[i % len(colors)])  # Cycle through color palette
-            ))
-
-            # Configure chart layout and styling
-            fig.update_layout(
-                title=f"{display_name} Over Time",
-                xaxis_title="Timestamp",
-                yaxis_title=display_name,
-                yaxis=dict(range=y_range),  # Apply calculated range
-                template="plotly_dark",      # Dark theme
-                height=350,
-                width=500,
-                font=dict(family="Arial, sans-serif", size=14),
-                margin=dict(l=30, r=30, t=50, b=50)  # Compact margins
-            )
-
-            # Convert chart to HTML and add to collection
-            charts.append({
-                'name': display_name,
-                'html': fig.to_html(full_html=False, div_id=f"chart-{column}")
-            })
-
-    return render_template("charts.html", client_id=client_id,
-                         charts=charts, time_range=time_range)
+    from plotly import __version__ as plotly_version
+
+    return stream_template("charts.html", client_id=client_id,
+                         charts=chain([first_chart], charts), time_range=time_range,
+                         plotly_version=plotly_version)
+
+def create_app(config_path: Optional[str] = None) -> Flask:
+    """
+    Build the Flask application from a configuration file.
+
+    Reads the configuration afresh, (re)initializes the storage backend from it
+    and registers the routes, plus the Ecowitt integration when enabled. Storage
+    and the caches derived from it are process-wide, so the app created last
+    owns them; calling this again closes the previous backend first.
+
+    Args:
+        config_path: Path to sensey.ini. If None, uses SENSEY_CONFIG_PATH or
+                    the standard search locations.
+
+    Returns:
+        Configured Flask application
+
+    Raises:
+        ConfigurationError: If the configuration is missing or invalid
+        StorageError: If the storage backend cannot be initialized
+    """
+    global _clients_cache, _index_cache
+
+    from config import reload_config
+    config_parser = reload_config(config_path).config
+
+    flask_app = Flask(__name__)
+    if ORJSON_AVAILABLE:
+        flask_app.json = OrjsonProvider(flask_app)
+
+    # Templates only change on deploy: outside debug mode, don't stat them on every
+    # render, and compile them at startup instead of on the first page view
+    flask_app.config['TEMPLATES_AUTO_RELOAD'] = DEBUG_MODE
+    for template_name in ("index.html", "charts.html"):
+        flask_app.jinja_env.get_template(template_name)
+
+    # Replace any backend from a previous create_app() and forget what was cached from it
+    sensey_data.close_storage()
+    initialize_storage()
+    _clients_cache = (0.0, None)
+    _index_cache = (None, None)
+    _charts_cache.clear()
+
+    # Get global system units setting (defaults to metric)
+    system_units = config_parser.get('server', 'system_units', fallback='metric')
+    flask_app.config['SYSTEM_UNITS'] = system_units
+    logger.info("System units: %s", system_units)
+
+    flask_app.add_url_rule("/data/<client_id>", view_func=receive_data, methods=["POST"])
+    flask_app.add_url_rule("/health", view_func=health)
+    flask_app.add_url_rule("/", view_func=index)
+    flask_app.add_url_rule("/plotly.min.js", view_func=plotly_js)
+    flask_app.add_url_rule("/charts/<client_id>", view_func=display_charts_for_client)
+
+    # Conditionally load Ecowitt integration
+    if 'ecowitt' in config_parser and config_parser['ecowitt'].getboolean('enabled', False):
+        logger.info("Loading Ecowitt integration...")
+        try:
+            from ecowitt import register_routes as register_ecowitt_routes
+            register_ecowitt_routes(flask_app, config_parser['ecowitt'], system_units)
+            logger.info("Ecowitt integration enabled")
+        except Exception as e:
+            logger.error("Failed to load Ecowitt integration: %s", e, exc_info=True)
+            raise
+    else:
+        logger.info("Ecowitt integration disabled (set enabled=true in [ecowitt] section to enable)")
+
+    return flask_app
+
+# Create the application on import (wsgi.py, python app.py)
+try:
+    app = create_app()
+except Exception as e:
+    logger.critical("FATAL: Storage initialization failed: %s", e)
+    logger.critical("Please check sensey.ini configuration and try again")
+    # Let the exception propagate - app should not start without storage
+    raise
 
 if __name__ == "__main__":
-    # Disable debug in production for security
-    debug_mode = os.environ.get('SENSEY_DEBUG', 'False').lower() == 'true'
-    app.run(host="0.0.0.0", port=5000, debug=debug_mode)
+    # Development server only; production runs under gunicorn (gunicorn.conf.py).
+    # SIGINT already raises KeyboardInterrupt; SIGTERM (podman stop, systemd)
+    # would otherwise kill the process without running atexit. Under gunicorn
+    # the worker owns its signal handlers, so this is only installed here.
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    app.run(host="0.0.0.0", port=5000, debug=DEBUG_MODE)
 
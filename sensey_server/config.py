@@ -12,6 +12,10 @@ from typing import Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# Validation tables, built once rather than on every SenseyConfig
+VALID_BACKENDS = frozenset({'csv', 'mysql', 'parquet'})
+MYSQL_REQUIRED_PARAMS = ('host', 'port', 'user', 'database')
+
 
 class ConfigurationError(Exception):
     """Exception raised for configuration-related errors."""
@@ -45,6 +49,33 @@ class SenseyConfig:
         self._load_config()
         self._validate_config()
 
+    @classmethod
+    def from_string(cls, text: str, source: str = "<string>") -> "SenseyConfig":
+        """
+        Build a configuration from INI text instead of a file.
+
+        Skips the config file search; the text is validated the same way.
+
+        Args:
+            text: INI-formatted configuration
+            source: Name reported as config_path and in error messages
+
+        Returns:
+            Validated SenseyConfig instance
+
+        Raises:
+            ConfigurationError: If the text cannot be parsed or is invalid
+        """
+        self = cls.__new__(cls)
+        self.config_path = source
+        self.config = configparser.ConfigParser()
+        try:
+            self.config.read_string(text, source=source)
+        except configparser.Error as e:
+            raise ConfigurationError(f"Failed to read config {source}: {e}")
+        self._validate_config()
+        return self
+
     def _resolve_config_path(self, config_path: Optional[str]) -> str:
         """
         Resolve the configuration file path.
@@ -64,29 +95,26 @@ class SenseyConfig:
         Raises:
             ConfigurationError: If config file not found
         """
-        # Priority 1: Explicit parameter
-        if config_path and os.path.exists(config_path):
-            logger.info(f"Using config from parameter: {config_path}")
-            return config_path
-
-        # Priority 2: Environment variable
-        env_path = os.environ.get('SENSEY_CONFIG_PATH')
-        if env_path and os.path.exists(env_path):
-            logger.info(f"Using config from SENSEY_CONFIG_PATH: {env_path}")
-            return env_path
-
-        # Priority 3: Current working directory
-        cwd_path = os.path.join(os.getcwd(), self.DEFAULT_CONFIG_FILENAME)
-        if os.path.exists(cwd_path):
-            logger.info(f"Using config from current directory: {cwd_path}")
-            return cwd_path
-
-        # Priority 4: Script directory
         script_dir = os.path.dirname(os.path.abspath(__file__))
         script_path = os.path.join(script_dir, self.DEFAULT_CONFIG_FILENAME)
-        if os.path.exists(script_path):
-            logger.info(f"Using config from script directory: {script_path}")
-            return script_path
+
+        candidates = [
+            (config_path, "parameter"),                                  # Priority 1
+            (os.environ.get('SENSEY_CONFIG_PATH'), "SENSEY_CONFIG_PATH"),  # Priority 2
+            (os.path.join(os.getcwd(), self.DEFAULT_CONFIG_FILENAME), "current directory"),  # Priority 3
+            (script_path, "script directory"),                           # Priority 4
+        ]
+
+        # One stat() per candidate, stopping at the first that exists
+        for path, source in candidates:
+            if not path:
+                continue
+            try:
+                os.stat(path)
+            except OSError:
+                continue
+            logger.info("Using config from %s: %s", source, path)
+            return path
 
         # Not found - provide helpful error message
         example_path = os.path.join(script_dir, self.EXAMPLE_CONFIG_FILENAME)
@@ -114,7 +142,7 @@ to your configuration file.
         """
         try:
             self.config.read(self.config_path)
-            logger.info(f"Configuration loaded from: {self.config_path}")
+            logger.info("Configuration loaded from: %s", self.config_path)
         except Exception as e:
             raise ConfigurationError(f"Failed to read config file {self.config_path}: {e}")
 
@@ -131,9 +159,9 @@ to your configuration file.
 
         # Validate storage backend
         backend = self.get_storage_backend()
-        if backend not in ['csv', 'mysql']:
+        if backend not in VALID_BACKENDS:
             raise ConfigurationError(
-                f"Invalid storage backend: '{backend}'. Must be 'csv' or 'mysql'"
+                f"Invalid storage backend: '{backend}'. Must be 'csv', 'mysql' or 'parquet'"
             )
 
         # Validate backend-specific configuration
@@ -141,8 +169,10 @@ to your configuration file.
             self._validate_csv_config()
         elif backend == 'mysql':
             self._validate_mysql_config()
+        elif backend == 'parquet':
+            self._validate_parquet_config()
 
-        logger.info(f"Configuration validated successfully (backend: {backend})")
+        logger.info("Configuration validated successfully (backend: %s)", backend)
 
     def _read_secret_file(self, env_var_name: str) -> Optional[str]:
         """
@@ -165,7 +195,7 @@ to your configuration file.
                 # Read and strip whitespace/newlines
                 return f.read().strip()
         except (FileNotFoundError, PermissionError, IOError) as e:
-            logger.warning(f"Failed to read secret from {secret_file_path}: {e}")
+            logger.warning("Failed to read secret from %s: %s", secret_file_path, e)
             return None
 
     def _validate_csv_config(self):
@@ -185,6 +215,19 @@ to your configuration file.
         if not data_dir:
             raise ConfigurationError("'data_dir' in [csv] section cannot be empty")
 
+    def _validate_parquet_config(self):
+        """
+        Validate Parquet storage configuration.
+
+        Raises:
+            ConfigurationError: If Parquet configuration is invalid
+        """
+        if 'parquet' not in self.config:
+            raise ConfigurationError("Missing [parquet] section for Parquet backend")
+
+        if not self.config['parquet'].get('data_dir'):
+            raise ConfigurationError("Missing or empty 'data_dir' in [parquet] section")
+
     def _validate_mysql_config(self):
         """
         Validate MySQL storage configuration.
@@ -203,12 +246,8 @@ to your configuration file.
                 "Please add MySQL connection parameters to sensey.ini"
             )
 
-        required_params = ['host', 'port', 'user', 'database']
-        missing = []
-
-        for param in required_params:
-            if param not in self.config['mysql'] or not self.config['mysql'][param]:
-                missing.append(param)
+        mysql_section = self.config['mysql']
+        missing = [param for param in MYSQL_REQUIRED_PARAMS if not mysql_section.get(param)]
 
         if missing:
             raise ConfigurationError(
@@ -250,7 +289,7 @@ to your configuration file.
         Get the configured storage backend type.
 
         Returns:
-            Storage backend type ('csv' or 'mysql')
+            Storage backend type ('csv', 'mysql' or 'parquet')
         """
         return self.config['storage']['backend'].lower()
 
@@ -276,6 +315,10 @@ to your configuration file.
             return {
                 'data_dir': self.config['csv']['data_dir']
             }
+        elif backend == 'parquet':
+            return {
+                'data_dir': self.config['parquet']['data_dir']
+            }
         elif backend == 'mysql':
             # Resolve password from multiple sources (priority order)
             password = (
@@ -41,6 +41,9 @@ def register_routes(app, ecowitt_config, system_units: str):
         app: Flask application instance
         ecowitt_config: ConfigParser section for [ecowitt]
         system_units: Global system units setting ('metric' or 'imperial')
+
+    Raises:
+        ValueError: If the configured client_name is not a valid client ID
     """
     # Import here to avoid circular dependency
     import sensey_data
@@ -49,9 +52,19 @@ def register_routes(app, ecowitt_config, system_units: str):
     url = ecowitt_config.get('url', '/ecowitt')
     client_name = ecowitt_config.get('client_name', None)
 
+    # Same rule as /data and /charts, so a station's charts page can be opened
+    if client_name and not sensey_data.is_valid_client_id(client_name):
+        raise ValueError(
+            f"Invalid [ecowitt] client_name {client_name!r}: use up to 64 letters, "
+            f"digits, '.', '_' or '-', starting with a letter or digit"
+        )
+
     # Convert to metric if system is configured for metric
     convert_to_metric = (system_units.lower() == 'metric')
 
+    # Field table for the configured units, chosen once here rather than per push
+    fields = _FIELDS_METRIC if convert_to_metric else _FIELDS_IMPERIAL
+
     logger.info(f"Registering Ecowitt endpoint: {url}")
     logger.info(f"Unit conversion: {'imperial → metric' if convert_to_metric else 'imperial (no conversion)'}")
 
@@ -61,9 +74,9 @@ def register_routes(app, ecowitt_config, system_units: str):
         Receive sensor data from Ecowitt device Custom Server push.
 
         Returns:
-            HTTP 200 with "success" on successful data storage
+            HTTP 200 with "success" once the reading is queued for storage
             HTTP 400 on invalid data
-            HTTP 500 on storage errors
+            HTTP 500 on errors, including a full write buffer
         """
         try:
             # Parse form-encoded data
@@ -73,22 +86,26 @@ def register_routes(app, ecowitt_config, system_units: str):
                 logger.warning("Received empty Ecowitt data")
                 return "error: no data", 400
 
-            logger.debug(f"Received Ecowitt data: {raw_data.keys()}")
+            logger.debug("Received Ecowitt data: %s", raw_data.keys())
 
             # Determine client ID
             device_id = _get_client_id(raw_data, client_name)
 
             # Transform Ecowitt format to Sensey format
-            sensor_data = _parse_ecowitt_data(raw_data, convert_to_metric)
+            sensor_data = _parse_fields(raw_data, fields)
 
-            # Store via sensey_data
-            sensey_data.store_data(device_id, sensor_data)
+            # Queue for the background batch writer; storage I/O happens off-request
+            sensey_data.queue_data(device_id, sensor_data)
 
-            logger.info(f"Stored Ecowitt data from {device_id}")
+            logger.info(f"Queued Ecowitt data from {device_id}")
 
             # Ecowitt expects simple success response
             return "success", 200
 
+        except ValueError as e:
+            # Reading rejected before queuing (e.g. unparseable dateutc)
+            logger.warning(f"Invalid Ecowitt data: {e}")
+            return "error: invalid data", 400
         except Exception as e:
             logger.error(f"Error processing Ecowitt data: {e}", exc_info=True)
             return "error", 500
@@ -123,6 +140,8 @@ def _parse_ecowitt_data(raw_data: Dict[str, str], convert_to_metric: bool) -> Di
     - Wind speed in mph
     - Rain in inches
 
+    Fields and their conversions are listed once in _FIELD_MAP.
+
     Args:
         raw_data: Raw form data from Ecowitt device
         convert_to_metric: Whether to convert to metric units
@@ -136,6 +155,20 @@ def _parse_ecowitt_data(raw_data: Dict[str, str], convert_to_metric: bool) -> Di
             ...
         }
     """
+    return _parse_fields(raw_data, _FIELDS_METRIC if convert_to_metric else _FIELDS_IMPERIAL)
+
+
+def _parse_fields(raw_data: Dict[str, str], fields) -> Dict[str, Any]:
+    """
+    Build a Sensey reading from Ecowitt form data using one field table.
+
+    Args:
+        raw_data: Raw form data from Ecowitt device
+        fields: _FIELDS_METRIC or _FIELDS_IMPERIAL
+
+    Returns:
+        Dictionary with standard Sensey sensor data format
+    """
     sensor_data = {}
 
     # Parse timestamp - Ecowitt sends as "dateutc" in format "2025-12-18 10:30:00"
@@ -145,108 +178,11 @@ def _parse_ecowitt_data(raw_data: Dict[str, str], convert_to_metric: bool) -> Di
     else:
         sensor_data['timestamp'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    # Outdoor temperature
-    if 'tempf' in raw_data:
-        temp = float(raw_data['tempf'])
-        sensor_data['temperature'] = _fahrenheit_to_celsius(temp) if convert_to_metric else temp
-
-    # Outdoor humidity
-    if 'humidity' in raw_data:
-        sensor_data['humidity'] = float(raw_data['humidity'])
-
-    # Barometric pressure (relative)
-    if 'baromrelin' in raw_data:
-        pressure = float(raw_data['baromrelin'])
-        sensor_data['pressure'] = _inhg_to_hpa(pressure) if convert_to_metric else pressure
-
-    # Wind speed
-    if 'windspeedmph' in raw_data:
-        speed = float(raw_data['windspeedmph'])
-        sensor_data['wind_speed'] = _mph_to_ms(speed) if convert_to_metric else speed
-
-    # Wind direction
-    if 'winddir' in raw_data:
-        sensor_data['wind_direction'] = float(raw_data['winddir'])
-
-    # Wind gust
-    if 'windgustmph' in raw_data:
-        gust = float(raw_data['windgustmph'])
-        sensor_data['wind_gust'] = _mph_to_ms(gust) if convert_to_metric else gust
-
-    # Max daily gust
-    if 'maxdailygust' in raw_data:
-        max_gust = float(raw_data['maxdailygust'])
-        sensor_data['wind_gust_max_daily'] = _mph_to_ms(max_gust) if convert_to_metric else max_gust
-
-    # Solar radiation
-    if 'solarradiation' in raw_data:
-        sensor_data['solar_radiation'] = float(raw_data['solarradiation'])
-
-    # UV index
-    if 'uv' in raw_data:
-        sensor_data['uv_index'] = float(raw_data['uv'])
-
-    # Rain rate (traditional rain gauge)
-    if 'rainratein' in raw_data:
-        rate = float(raw_data['rainratein'])
-        sensor_data['rain_rate'] = _inches_to_mm(rate) if convert_to_metric else rate
-
-    # Rain rate (piezo rain sensor)
-    if 'rrain_piezo' in raw_data:
-        rate = float(raw_data['rrain_piezo'])
-        sensor_data['rain_rate'] = _inches_to_mm(rate) if convert_to_metric else rate
-
-    # Daily rain (traditional rain gauge)
-    if 'dailyrainin' in raw_data:
-        rain = float(raw_data['dailyrainin'])
-        sensor_data['rain_daily'] = _inches_to_mm(rain) if convert_to_metric else rain
-
-    # Daily rain (piezo rain sensor)
-    if 'drain_piezo' in raw_data:
-        rain = float(raw_data['drain_piezo'])
-        sensor_data['rain_daily'] = _inches_to_mm(rain) if convert_to_metric else rain
-
-    # Hourly rain (piezo)
-    if 'hrain_piezo' in raw_data:
-        rain = float(raw_data['hrain_piezo'])
-        sensor_data['rain_hourly'] = _inches_to_mm(rain) if convert_to_metric else rain
-
-    # Weekly rain (piezo)
-    if 'wrain_piezo' in raw_data:
-        rain = float(raw_data['wrain_piezo'])
-        sensor_data['rain_weekly'] = _inches_to_mm(rain) if convert_to_metric else rain
-
-    # Monthly rain (piezo)
-    if 'mrain_piezo' in raw_data:
-        rain = float(raw_data['mrain_piezo'])
-        sensor_data['rain_monthly'] = _inches_to_mm(rain) if convert_to_metric else rain
-
-    # Yearly rain (piezo)
-    if 'yrain_piezo' in raw_data:
-        rain = float(raw_data['yrain_piezo'])
-        sensor_data['rain_yearly'] = _inches_to_mm(rain) if convert_to_metric else rain
-
-    # Indoor temperature (optional)
-    if 'tempinf' in raw_data:
-        temp_in = float(raw_data['tempinf'])
-        sensor_data['temperature_indoor'] = _fahrenheit_to_celsius(temp_in) if convert_to_metric else temp_in
-
-    # Indoor humidity (optional)
-    if 'humidityin' in raw_data:
-        sensor_data['humidity_indoor'] = float(raw_data['humidityin'])
-
-    # Absolute pressure (optional)
-    if 'baromabsin' in raw_data:
-        pressure_abs = float(raw_data['baromabsin'])
-        sensor_data['pressure_absolute'] = _inhg_to_hpa(pressure_abs) if convert_to_metric else pressure_abs
-
-    # Battery voltage (WH90 sensor)
-    if 'wh90batt' in raw_data:
-        sensor_data['battery_wh90'] = float(raw_data['wh90batt'])
-
-    # Battery voltage (WH65 sensor)
-    if 'wh65batt' in raw_data:
-        sensor_data['battery_wh65'] = float(raw_data['wh65batt'])
+    # One pass over the field table; no per-field unit checks
+    for key, name, parse in fields:
+        value = raw_data.get(key)
+        if value is not None:
+            sensor_data[name] = parse(value)
 
     # TODO: Add more fields as needed
     # - Soil moisture sensors (soilmoisture1-8)
@@ -259,23 +195,67 @@ def _parse_ecowitt_data(raw_data: Dict[str, str], convert_to_metric: bool) -> Di
 
 
 # Unit conversion functions
+# Full precision is stored; rounding for display happens in the charts
 # TODO: Move these to a shared utils module for reuse across sensors
 
 def _fahrenheit_to_celsius(fahrenheit: float) -> float:
     """Convert temperature from °F to °C"""
-    return round((fahrenheit - 32) * 5 / 9, 2)
+    return (fahrenheit - 32) * 5 / 9
 
 
 def _inhg_to_hpa(inhg: float) -> float:
     """Convert pressure from inHg to hPa (millibars)"""
-    return round(inhg * 33.8639, 2)
+    return inhg * 33.8639
 
 
 def _mph_to_ms(mph: float) -> float:
     """Convert wind speed from mph to m/s"""
-    return round(mph * 0.44704, 2)
+    return mph * 0.44704
 
 
 def _inches_to_mm(inches: float) -> float:
     """Convert rainfall from inches to mm"""
-    return round(inches * 25.4, 2)
+    return inches * 25.4
+
+
+# Field mapping
+# Ecowitt form field -> (Sensey field, metric conversion or None if unit-less).
+# Order matters: later entries overwrite earlier ones with the same Sensey
+# field, so the piezo rain sensor wins over the traditional gauge.
+_FIELD_MAP = (
+    ('tempf', 'temperature', _fahrenheit_to_celsius),            # Outdoor temperature
+    ('humidity', 'humidity', None),                              # Outdoor humidity
+    ('baromrelin', 'pressure', _inhg_to_hpa),                    # Barometric pressure (relative)
+    ('windspeedmph', 'wind_speed', _mph_to_ms),                  # Wind speed
+    ('winddir', 'wind_direction', None),                         # Wind direction
+    ('windgustmph', 'wind_gust', _mph_to_ms),                    # Wind gust
+    ('maxdailygust', 'wind_gust_max_daily', _mph_to_ms),         # Max daily gust
+    ('solarradiation', 'solar_radiation', None),                 # Solar radiation
+    ('uv', 'uv_index', None),                                    # UV index
+    ('rainratein', 'rain_rate', _inches_to_mm),                  # Rain rate (traditional rain gauge)
+    ('rrain_piezo', 'rain_rate', _inches_to_mm),                 # Rain rate (piezo rain sensor)
+    ('dailyrainin', 'rain_daily', _inches_to_mm),                # Daily rain (traditional rain gauge)
+    ('drain_piezo', 'rain_daily', _inches_to_mm),                # Daily rain (piezo rain sensor)
+    ('hrain_piezo', 'rain_hourly', _inches_to_mm),               # Hourly rain (piezo)
+    ('wrain_piezo', 'rain_weekly', _inches_to_mm),               # Weekly rain (piezo)
+    ('mrain_piezo', 'rain_monthly', _inches_to_mm),              # Monthly rain (piezo)
+    ('yrain_piezo', 'rain_yearly', _inches_to_mm),               # Yearly rain (piezo)
+    ('tempinf', 'temperature_indoor', _fahrenheit_to_celsius),   # Indoor temperature (optional)
+    ('humidityin', 'humidity_indoor', None),                     # Indoor humidity (optional)
+    ('baromabsin', 'pressure_absolute', _inhg_to_hpa),           # Absolute pressure (optional)
+    ('wh90batt', 'battery_wh90', None),                          # Battery voltage (WH90 sensor)
+    ('wh65batt', 'battery_wh65', None),                          # Battery voltage (WH65 sensor)
+)
+
+
+def _metric_parser(convert):
+    """Return a str -> float parser that applies a metric conversion."""
+    return lambda value: convert(float(value))
+
+
+# (Ecowitt field, Sensey field, parser) tables, built once per unit system
+_FIELDS_IMPERIAL = tuple((key, name, float) for key, name, _ in _FIELD_MAP)
+_FIELDS_METRIC = tuple(
+    (key, name, _metric_parser(convert) if convert else float)
+    for key, name, convert in _FIELD_MAP
+)
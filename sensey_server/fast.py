@@ -0,0 +1,149 @@
+"""
+Numeric kernels used when building charts.
+
+Both functions take contiguous float64 numpy arrays. When numba is installed
+the loop kernels are JIT-compiled (and cached on disk, so only the first
+request after an install pays the compile); otherwise vectorized numpy
+versions of the same algorithms are used. Results are identical either way.
+"""
+
+import numpy as np
+
+# Try to import numba (optional, compiled min/max and LTTB kernels)
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _minmax_loop(a):
+    """Single-pass NaN-skipping min/max (compiled with numba when available)."""
+    mn = np.nan
+    mx = np.nan
+    for v in a:
+        if v != v:  # NaN
+            continue
+        if mn != mn or v < mn:
+            mn = v
+        if mx != mx or v > mx:
+            mx = v
+    return mn, mx
+
+
+def _minmax_numpy(a):
+    """Vectorized NaN-skipping min/max (two numpy passes)."""
+    valid = a[~np.isnan(a)]
+    if valid.size == 0:
+        return np.nan, np.nan
+    return valid.min(), valid.max()
+
+
+def _lttb_loop(x, y, n_out):
+    """Explicit-loop LTTB selection (compiled with numba when available)."""
+    n = x.shape[0]
+    # n_out - 2 buckets over the interior points [1, n - 1)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[n_out - 1] = n - 1
+    a = 0
+    for k in range(n_out - 2):
+        lo, hi = edges[k], edges[k + 1]
+        if k + 1 < n_out - 2:
+            # Average of the next bucket
+            cx = 0.0
+            cy = 0.0
+            for j in range(hi, edges[k + 2]):
+                cx += x[j]
+                cy += y[j]
+            cx /= edges[k + 2] - hi
+            cy /= edges[k + 2] - hi
+        else:
+            cx, cy = x[n - 1], y[n - 1]
+        ax, ay = x[a], y[a]
+
+        best_area = -1.0
+        best = lo
+        for j in range(lo, hi):
+            area = abs((ax - cx) * (y[j] - ay) - (ax - x[j]) * (cy - ay))
+            if area > best_area:
+                best_area = area
+                best = j
+        a = best
+        selected[k + 1] = a
+    return selected
+
+
+def _lttb_numpy(x, y, n_out):
+    """LTTB selection with the per-bucket work vectorized in numpy."""
+    n = len(x)
+    # n_out - 2 buckets over the interior points [1, n - 1)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    avg_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for k in range(n_out - 2):
+        lo, hi = edges[k], edges[k + 1]
+        if k + 1 < n_out - 2:
+            cx, cy = avg_x[k + 1], avg_y[k + 1]
+        else:
+            cx, cy = x[n - 1], y[n - 1]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - cx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (cy - ay))
+        a = lo + int(np.argmax(area))
+        selected[k + 1] = a
+    return selected
+
+
+if NUMBA_AVAILABLE:
+    # No fastmath: it lets the compiler assume NaN never occurs, which would
+    # break the NaN skipping in _minmax_loop
+    _minmax_impl = numba.njit(cache=True)(_minmax_loop)
+    _lttb_impl = numba.njit(cache=True)(_lttb_loop)
+else:
+    _minmax_impl = _minmax_numpy
+    _lttb_impl = _lttb_numpy
+
+
+def minmax(a):
+    """
+    Return the (min, max) of an array, ignoring NaN.
+
+    Args:
+        a (ndarray): float64 values
+
+    Returns:
+        Tuple of (min, max) as floats; (nan, nan) if there are no valid values
+    """
+    mn, mx = _minmax_impl(np.ascontiguousarray(a, dtype=np.float64))
+    return float(mn), float(mx)
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Picks n_out points that preserve the visual shape of the series: the first
+    and last points are always kept, and from each bucket in between the point
+    forming the largest triangle with the previously chosen point and the
+    next bucket's average is selected. Unlike averaging, peaks survive.
+
+    Args:
+        x (ndarray): Monotonic float x values (e.g. seconds)
+        y (ndarray): Float y values without NaN, same length as x
+        n_out (int): Number of points to keep
+
+    Returns:
+        ndarray of selected indices, in increasing order
+    """
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    return _lttb_impl(np.ascontiguousarray(x, dtype=np.float64),
+                      np.ascontiguousarray(y, dtype=np.float64), n_out)
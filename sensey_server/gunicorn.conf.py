@@ -0,0 +1,48 @@
+"""
+Gunicorn configuration for the Sensey Server.
+
+Gunicorn picks this file up automatically when started from this directory:
+
+    gunicorn wsgi:application
+
+gevent workers run each request in a green thread, so client POSTs, health
+probes and chart renders are served concurrently instead of queueing behind
+one another as they do under the single-threaded Flask development server.
+
+Environment Variables:
+    SENSEY_BIND: Address to listen on (default: 0.0.0.0:5000)
+    WEB_CONCURRENCY: Number of worker processes (default: 4)
+"""
+
+import os
+
+bind = os.environ.get("SENSEY_BIND", "0.0.0.0:5000")
+
+# Load the app in each worker after fork, so every worker initializes its own
+# storage backend (file handles, MySQL pool) instead of sharing the master's
+preload_app = False
+workers = int(os.environ.get("WEB_CONCURRENCY", "4"))
+worker_class = "gevent"
+worker_connections = 1000
+
+# Chart renders for long time ranges can take a while on a Raspberry Pi
+timeout = 60
+# Also the time a stopping worker gets to finish requests and run worker_exit
+graceful_timeout = 30
+
+# Log to stdout/stderr (journald / podman logs)
+accesslog = "-"
+errorlog = "-"
+
+
+def worker_exit(server, worker):
+    """
+    Flush queued readings and close storage as a worker shuts down.
+
+    Runs inside the worker after it stops serving requests, on every graceful
+    exit (SIGTERM, max_requests recycling, HUP reload), so batched writes no
+    longer depend on atexit running during interpreter teardown. The app's
+    atexit handler stays as a fallback; closing twice is harmless.
+    """
+    import sensey_data
+    sensey_data.close_storage()
@@ -21,15 +21,37 @@ Migration Guide:
     New: storage.get_latest_data(client_id, "3d")
 """
 
+import re
 import pandas as pd
 import logging
-from typing import Optional, Dict, Any, List
+import threading
+from collections import deque
+from typing import Optional, Dict, Any, List, Hashable, Set, Tuple, Deque, Iterable
+
+from storage.base import StorageError, BatchStoreError
 
 logger = logging.getLogger(__name__)
 
 # Module-level storage instance (singleton)
 # Will be initialized on first use or by set_storage()
 _storage = None
+_storage_lock = threading.Lock()  # Guards auto-initialization in _get_storage()
+
+# Write-behind buffer for incoming readings (see queue_data/flush_pending).
+# Readings are appended here by request handlers and written to storage in
+# batches by a background thread, so a POST never waits on storage I/O.
+MAX_PENDING = 10000          # Reject new readings beyond this (client retries)
+MAX_BATCH = 256              # Readings per store_batch() call; a full batch wakes the flusher early
+FLUSH_INTERVAL = 1.0         # Seconds between background flushes
+MAX_FLUSH_RETRIES = 10       # Failed flushes in a row before a client's queued readings are dropped
+
+_pending: Deque[Tuple[str, Dict[str, Any]]] = deque()
+_pending_lock = threading.Lock()
+_flush_lock = threading.Lock()  # Serializes flushes so batches land in order
+_flush_stop = threading.Event()
+_flush_wake = threading.Event()  # Set when a full batch is waiting
+_flush_thread: Optional[threading.Thread] = None
+_flush_failures: Dict[str, int] = {}  # client_id -> failed flushes in a row (guarded by _flush_lock)
 
 
 def set_storage(storage_instance):
@@ -49,7 +71,8 @@ def set_storage(storage_instance):
         sensey_data.set_storage(storage)
     """
     global _storage
-    _storage = storage_instance
+    with _storage_lock:
+        _storage = storage_instance
     logger.info(f"Storage backend set: {type(storage_instance).__name__}")
 
 
@@ -57,33 +80,49 @@ def _get_storage():
     """
     Get the storage instance, initializing it if necessary.
 
+    The initialized case is a single global read; only auto-initialization
+    takes the lock, so concurrent first requests create one backend, not several.
+
     Returns:
         Storage instance
 
     Raises:
         RuntimeError: If storage initialization fails
     """
+    storage = _storage
+    if storage is not None:
+        return storage
+
+    with _storage_lock:
+        if _storage is None:
+            _init_storage_from_config()
+        return _storage
+
+
+def _init_storage_from_config():
+    """Auto-initialize the storage backend from config (caller holds _storage_lock)."""
     global _storage
 
-    if _storage is None:
-        # Auto-initialize from config (fallback behavior)
-        logger.warning(
-            "Storage not explicitly initialized. Auto-initializing from config. "
-            "Consider calling set_storage() at application startup."
-        )
-        try:
-            from storage import create_storage_from_config
-            _storage = create_storage_from_config()
-            _storage.initialize()
-            logger.info("Auto-initialized storage from configuration")
-        except Exception as e:
-            logger.error(f"Failed to auto-initialize storage: {e}")
-            raise RuntimeError(
-                "Storage not initialized and auto-initialization failed. "
-                "Please ensure sensey.ini exists and call set_storage() at startup."
-            ) from e
+    # Auto-initialize from config (fallback behavior)
+    logger.warning(
+        "Storage not explicitly initialized. Auto-initializing from config. "
+        "Consider calling set_storage() at application startup."
+    )
+    try:
+        from storage import create_storage_from_config
+        storage = create_storage_from_config()
+        storage.initialize()
+    except Exception as e:
+        logger.error(f"Failed to auto-initialize storage: {e}")
+        raise RuntimeError(
+            "Storage not initialized and auto-initialization failed. "
+            "Please ensure sensey.ini exists and call set_storage() at startup."
+        ) from e
 
-    return _storage
+    # Published only once fully initialized, so the unlocked fast path
+    # never sees a half-initialized backend
+    _storage = storage
+    logger.info("Auto-initialized storage from configuration")
 
 
 def get_available_clients() -> List[str]:
@@ -93,6 +132,7 @@ def get_available_clients() -> List[str]:
     Returns:
         List of client identifier strings
     """
+    _flush_before_read()
     storage = _get_storage()
     return storage.get_available_clients()
 
@@ -112,19 +152,287 @@ def store_data(client_id: str, sensor_data: Dict[str, Any]):
     storage.store_data(client_id, sensor_data)
 
 
-def get_latest_data(client_id: str, time_range: str = "3d") -> Optional[pd.DataFrame]:
+def store_batch(records: Iterable[Tuple[str, Dict[str, Any]]]):
+    """
+    Store several readings at once, bypassing the write-behind queue.
+
+    Args:
+        records: Iterable of (client_id, sensor_data) tuples, oldest first
+
+    Raises:
+        StorageError: If data cannot be stored
+    """
+    storage = _get_storage()
+    storage.store_batch(records)
+
+
+# Valid client IDs: hostnames and generated IDs like "ecowitt-<passkey>".
+# Anything else is rejected before it reaches storage (file names / queries) or logs.
+_CLIENT_ID_RE = re.compile(r"\A[A-Za-z0-9][A-Za-z0-9._-]{0,63}\Z")
+
+
+def is_valid_client_id(client_id: Any) -> bool:
+    """
+    Check a client ID against the pattern every read and write path accepts.
+
+    Args:
+        client_id: Candidate client identifier
+
+    Returns:
+        True if the ID can be stored and looked up
+    """
+    return isinstance(client_id, str) and _CLIENT_ID_RE.match(client_id) is not None
+
+
+def _check_reading(sensor_data: Any) -> None:
+    """
+    Reject a reading that no backend could store, before it is queued.
+
+    A queued reading is only written later, in a batch with other clients'
+    readings, so it is checked here where the sender can still be told.
+
+    Args:
+        sensor_data: Reading to check
+
+    Raises:
+        ValueError: If the reading is not a dict or its timestamp can't be parsed
+    """
+    if not isinstance(sensor_data, dict):
+        raise ValueError(f"Reading must be an object, not {type(sensor_data).__name__}")
+
+    readings = sensor_data.get('readings')
+    for source in (sensor_data, readings if isinstance(readings, dict) else {}):
+        timestamp = source.get('timestamp')
+        if timestamp is None:
+            continue
+        if not isinstance(timestamp, str):
+            raise ValueError(f"Timestamp must be an ISO 8601 string, not {type(timestamp).__name__}")
+        try:
+            pd.to_datetime(timestamp, format="ISO8601")
+        except ValueError:
+            raise ValueError(f"Invalid timestamp: {timestamp!r}")
+
+
+def queue_data(client_id: str, sensor_data: Dict[str, Any]):
+    """
+    Queue sensor data for a batched write by the background flusher.
+
+    Returns immediately; the reading is written on the next flush_pending()
+    call (at most FLUSH_INTERVAL seconds later once start_background_flush()
+    has been called, or before the next read through this module).
+
+    Args:
+        client_id: Unique identifier for the client
+        sensor_data: Dictionary containing sensor readings and timestamp
+
+    Raises:
+        ValueError: If the client ID is invalid or the reading is malformed (see _check_reading)
+        StorageError: If the buffer is full (storage is falling behind)
+    """
+    if not is_valid_client_id(client_id):
+        raise ValueError(f"Invalid client ID: {client_id!r}")
+    _check_reading(sensor_data)
+
+    with _pending_lock:
+        if len(_pending) >= MAX_PENDING:
+            raise StorageError(
+                f"Write buffer full ({MAX_PENDING} pending readings), "
+                f"dropping data from {client_id}"
+            )
+        _pending.append((client_id, sensor_data))
+        if len(_pending) >= MAX_BATCH:
+            _flush_wake.set()
+
+
+def flush_pending(max_items: Optional[int] = None) -> int:
+    """
+    Write queued readings to storage in a single batch.
+
+    On failure, the readings of the clients that could not be stored are put
+    back at the front of the queue and retried, in order, on the next flush;
+    clients the backend reports as stored are not written twice. A client
+    that fails MAX_FLUSH_RETRIES flushes in a row has its queued readings
+    dropped (and logged), so one unstorable reading can't stall the queue.
+
+    Args:
+        max_items: Write at most this many of the oldest readings (None for all)
+
+    Returns:
+        Number of readings written
+
+    Raises:
+        StorageError: If the batch cannot be stored
+    """
+    with _flush_lock:
+        with _pending_lock:
+            if not _pending:
+                return 0
+            if max_items is None or max_items >= len(_pending):
+                batch = list(_pending)
+                _pending.clear()
+            else:
+                batch = [_pending.popleft() for _ in range(max_items)]
+
+        try:
+            _get_storage().store_batch(batch)
+        except Exception as e:
+            # Without a per-client report, nothing in the batch is known to be stored
+            failed = e.failed_clients if isinstance(e, BatchStoreError) else {c for c, _ in batch}
+            _requeue_failed(batch, failed)
+            raise
+
+        for client_id in {c for c, _ in batch}:
+            _flush_failures.pop(client_id, None)
+
+        logger.debug(f"Flushed {len(batch)} queued readings to storage")
+        return len(batch)
+
+
+def _requeue_failed(batch: List[Tuple[str, Dict[str, Any]]], failed: Set[str]) -> None:
+    """
+    Put the failed clients' readings from a batch back at the front of the queue.
+
+    Called with _flush_lock held. A client that has now failed more than
+    MAX_FLUSH_RETRIES flushes in a row is dropped instead of re-queued.
+
+    Args:
+        batch: The batch passed to store_batch()
+        failed: Client IDs whose readings were not stored
+    """
+    for client_id in {c for c, _ in batch} - failed:
+        _flush_failures.pop(client_id, None)
+
+    dropped = set()
+    for client_id in failed:
+        _flush_failures[client_id] = _flush_failures.get(client_id, 0) + 1
+        if _flush_failures[client_id] > MAX_FLUSH_RETRIES:
+            dropped.add(client_id)
+            del _flush_failures[client_id]
+
+    retried = failed - dropped
+    retry = [record for record in batch if record[0] in retried]
+    with _pending_lock:
+        _pending.extendleft(reversed(retry))
+
+    for client_id in dropped:
+        count = sum(1 for c, _ in batch if c == client_id)
+        logger.error(f"Dropping {count} queued readings from {client_id} "
+                     f"after {MAX_FLUSH_RETRIES} failed retries")
+
+
+def _flush_before_read():
+    """Flush queued readings so reads see everything already acknowledged."""
+    if not _pending:
+        return
+    try:
+        flush_pending()
+    except Exception as e:
+        # Keep serving reads from what is already stored
+        logger.error(f"Failed to flush queued readings before read: {e}")
+
+
+def _flush_loop(interval: float):
+    """
+    Background thread body: drain the queue in MAX_BATCH chunks every
+    `interval` seconds, or as soon as a full batch is waiting.
+    """
+    while not _flush_stop.is_set():
+        _flush_wake.wait(interval)
+        _flush_wake.clear()
+        try:
+            while flush_pending(MAX_BATCH) == MAX_BATCH:
+                pass
+        except Exception as e:
+            logger.error(f"Background flush failed, will retry: {e}")
+            # Back off before retrying, even if new readings keep waking us
+            _flush_stop.wait(interval)
+
+
+def start_background_flush(interval: float = FLUSH_INTERVAL):
+    """
+    Start the daemon thread that periodically writes queued readings.
+
+    Safe to call more than once; only one flusher thread is started.
+
+    Args:
+        interval: Seconds between flushes
+    """
+    global _flush_thread
+
+    if _flush_thread is not None and _flush_thread.is_alive():
+        return
+
+    _flush_stop.clear()
+    _flush_wake.clear()
+    _flush_thread = threading.Thread(
+        target=_flush_loop, args=(interval,), name="sensey-flush", daemon=True
+    )
+    _flush_thread.start()
+    logger.info(f"Background flush started (interval: {interval}s)")
+
+
+def stop_background_flush():
+    """Stop the background flusher thread, if running."""
+    global _flush_thread
+
+    if _flush_thread is None:
+        return
+
+    _flush_stop.set()
+    _flush_wake.set()
+    _flush_thread.join(timeout=FLUSH_INTERVAL * 5)
+    _flush_thread = None
+
+
+def get_latest_data(
+    client_id: str,
+    time_range: str = "3d",
+    columns: Optional[List[str]] = None
+) -> Optional[pd.DataFrame]:
     """
     Read data for a client with flexible time range support.
 
     Args:
         client_id: Client identifier
         time_range: Time range in format like '1h', '6h', '1d', '3d', '7d', 'all'
+        columns: Columns to return (None for all)
 
     Returns:
         DataFrame with sensor data, or None if no data exists
     """
+    _flush_before_read()
     storage = _get_storage()
-    return storage.get_latest_data(client_id, time_range)
+    return storage.get_latest_data(client_id, time_range, columns=columns)
+
+
+def get_numeric_columns(client_id: str) -> Optional[List[str]]:
+    """
+    Return the client's numeric sensor column names, if the backend can tell cheaply.
+
+    Args:
+        client_id: Client identifier
+
+    Returns:
+        List of column names (excluding timestamp), or None if unknown
+    """
+    _flush_before_read()
+    storage = _get_storage()
+    return storage.get_numeric_columns(client_id)
+
+
+def get_data_version(client_id: str) -> Optional[Hashable]:
+    """
+    Return a token that changes whenever the client's stored data changes.
+
+    Args:
+        client_id: Client identifier
+
+    Returns:
+        Hashable version token, or None if the backend can't provide one
+    """
+    _flush_before_read()
+    storage = _get_storage()
+    return storage.get_data_version(client_id)
 
 
 def get_all_clients_data(time_range: str = "3d") -> Dict[str, pd.DataFrame]:
@@ -137,6 +445,7 @@ def get_all_clients_data(time_range: str = "3d") -> Dict[str, pd.DataFrame]:
     Returns:
         Dictionary mapping client_id to DataFrame of sensor data
     """
+    _flush_before_read()
     storage = _get_storage()
     return storage.get_all_clients_data(time_range)
 
@@ -149,8 +458,19 @@ def close_storage():
     """
     global _storage
 
+    stop_background_flush()
+
     if _storage is not None:
+        # Write out anything still queued before closing
+        try:
+            flush_pending()
+        except Exception as e:
+            logger.error(f"Dropping {len(_pending)} queued readings on shutdown: {e}")
+            _pending.clear()
+
         _storage.close()
         logger.info("Storage closed via sensey_data compatibility layer")
         _storage = None
 
+    _flush_failures.clear()
+
@@ -6,6 +6,7 @@ This package provides a pluggable storage backend system for Sensey sensor data.
 Supported Backends:
 - CSV: File-based storage (default, no additional dependencies)
 - MySQL: Database storage (requires mysql-connector-python)
+- Parquet: Columnar file storage (requires pyarrow)
 
 Configuration:
 --------------
@@ -33,7 +34,7 @@ import logging
 from typing import Optional
 
 # Import base classes
-from .base import SenseyStorage, StorageError
+from .base import SenseyStorage, StorageError, BatchStoreError
 
 # Import CSV storage (always available)
 from .csv_storage import CSVStorage
@@ -46,6 +47,9 @@ except ImportError:
     MYSQL_AVAILABLE = False
     MySQLStorage = None
 
+# Try to import Parquet storage (optional dependency)
+from .parquet_storage import ParquetStorage, PYARROW_AVAILABLE
+
 logger = logging.getLogger(__name__)
 
 
@@ -54,7 +58,7 @@ def create_storage(storage_type: str, **kwargs) -> SenseyStorage:
     Factory function to create storage backend instances.
 
     Args:
-        storage_type: Type of storage ("csv" or "mysql")
+        storage_type: Type of storage ("csv", "mysql" or "parquet")
         **kwargs: Configuration parameters for the storage backend
 
     Returns:
@@ -69,6 +73,9 @@ def create_storage(storage_type: str, **kwargs) -> SenseyStorage:
     # CSV storage
     storage = create_storage("csv", data_dir="/var/sensey/data")
 
+    # Parquet storage
+    storage = create_storage("parquet", data_dir="/var/sensey/data")
+
     # MySQL storage
     storage = create_storage(
         "mysql",
@@ -97,10 +104,18 @@ def create_storage(storage_type: str, **kwargs) -> SenseyStorage:
             f"{kwargs.get('database', 'sensey')}"
         )
         return MySQLStorage(**kwargs)
+    elif storage_type == "parquet":
+        if not PYARROW_AVAILABLE:
+            raise StorageError(
+                "Parquet storage requested but pyarrow is not installed. "
+                "Install with: pip install pyarrow"
+            )
+        logger.info(f"Creating Parquet storage with data_dir={kwargs.get('data_dir', 'data')}")
+        return ParquetStorage(**kwargs)
     else:
         raise ValueError(
             f"Unknown storage type: '{storage_type}'. "
-            f"Supported types: csv, mysql"
+            f"Supported types: csv, mysql, parquet"
         )
 
 
@@ -158,8 +173,10 @@ def create_storage_from_config(config_path: Optional[str] = None) -> SenseyStora
 __all__ = [
     'SenseyStorage',
     'StorageError',
+    'BatchStoreError',
     'CSVStorage',
     'MySQLStorage',
+    'ParquetStorage',
     'create_storage',
     'create_storage_from_config',
 ]
@@ -5,13 +5,47 @@ This module defines the interface that all storage implementations must follow.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Hashable, Iterable, Set, Tuple
 import pandas as pd
 from datetime import datetime, timedelta
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Fallback window for unrecognized time range strings
+DEFAULT_TIME_RANGE = timedelta(days=3)
+
+
+@lru_cache(maxsize=32)
+def _parse_time_delta(time_range: str) -> Optional[timedelta]:
+    """
+    Parse a time range string into a timedelta, once per distinct string.
+
+    Args:
+        time_range: Time range string (e.g., '1h', '6h', '1d', '3d', '1w', 'all')
+
+    Returns:
+        timedelta for the range, or None for 'all'
+    """
+    if time_range == "all":
+        return None
+
+    try:
+        if time_range.endswith('h'):
+            return timedelta(hours=int(time_range[:-1]))
+        elif time_range.endswith('d'):
+            return timedelta(days=int(time_range[:-1]))
+        elif time_range.endswith('w'):
+            return timedelta(weeks=int(time_range[:-1]))
+    except (ValueError, IndexError):
+        logger.warning(f"Invalid time range format: {time_range}, defaulting to 3 days")
+        return DEFAULT_TIME_RANGE
+
+    # Default to 3 days if format not recognized
+    return DEFAULT_TIME_RANGE
+
 
 class SenseyStorage(ABC):
     """
@@ -55,11 +89,39 @@ class SenseyStorage(ABC):
         """
         pass
 
+    def store_batch(self, records: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Store several sensor readings at once.
+
+        The default implementation calls store_data() for each record in order.
+        Backends override this to write a whole batch with fewer I/O operations.
+        Once a client's record fails, that client's later records are skipped
+        (so a retry keeps them in order); other clients are still written.
+
+        Args:
+            records: Iterable of (client_id, sensor_data) tuples, oldest first
+
+        Raises:
+            BatchStoreError: If some clients' records could not be stored
+            StorageError: If the batch could not be stored at all
+        """
+        errors: Dict[str, Exception] = {}
+        for client_id, sensor_data in records:
+            if client_id in errors:
+                continue
+            try:
+                self.store_data(client_id, sensor_data)
+            except Exception as e:
+                errors[client_id] = e
+        if errors:
+            raise BatchStoreError(errors)
+
     @abstractmethod
     def get_latest_data(
         self,
         client_id: str,
-        time_range: str = "3d"
+        time_range: str = "3d",
+        columns: Optional[List[str]] = None
     ) -> Optional[pd.DataFrame]:
         """
         Retrieve sensor data for a client within a specified time range.
@@ -67,6 +129,8 @@ class SenseyStorage(ABC):
         Args:
             client_id: Unique identifier for the client
             time_range: Time range string (e.g., '1h', '6h', '1d', '3d', 'all')
+            columns: Columns to return (None for all). Unknown names are ignored;
+                    include 'timestamp' if time filtering/sorting is needed.
 
         Returns:
             DataFrame with timestamp and sensor columns, or None if no data exists
@@ -97,8 +161,43 @@ class SenseyStorage(ABC):
         """
         pass
 
+    # Optional capabilities (backends may override)
+
+    def get_data_version(self, client_id: str) -> Optional[Hashable]:
+        """
+        Return a cheap token that changes whenever a client's stored data changes.
+
+        Callers use it as a cache key for derived results (e.g. rendered charts).
+        The default implementation returns None, meaning "unknown - don't cache".
+
+        Args:
+            client_id: Unique identifier for the client
+
+        Returns:
+            Hashable version token, or None if not supported / no data
+        """
+        return None
+
+    def get_numeric_columns(self, client_id: str) -> Optional[List[str]]:
+        """
+        Return the names of a client's numeric sensor columns, without loading its data.
+
+        Lets callers request only those columns from get_latest_data().
+        The default implementation returns None, meaning "unknown - fetch all".
+
+        Args:
+            client_id: Unique identifier for the client
+
+        Returns:
+            List of numeric column names (excluding timestamp), or None
+        """
+        return None
+
     # Utility methods available to all implementations
 
+    # Threads used by read_clients_concurrently()
+    MAX_READ_WORKERS = 8
+
     def parse_time_range(self, time_range: str) -> Optional[datetime]:
         """
         Parse time range string and return cutoff datetime.
@@ -109,27 +208,76 @@ class SenseyStorage(ABC):
         Returns:
             datetime object representing the cutoff time, or None for 'all'
         """
-        if time_range == "all":
+        # The string is parsed once per distinct range; only now() is per call
+        delta = _parse_time_delta(time_range)
+        if delta is None:
             return None
+        return datetime.now() - delta
+
+    def read_clients_concurrently(self, time_range: str) -> Dict[str, pd.DataFrame]:
+        """
+        Read every client's data with get_latest_data() on a small thread pool.
+
+        For backends where each client is an independent file: the reads are
+        file I/O plus pandas C code that releases the GIL, so they overlap
+        instead of running one after another.
+
+        Args:
+            time_range: Time range string (e.g., '1h', '6h', '1d', '3d', 'all')
+
+        Returns:
+            Dictionary mapping client_id to non-empty DataFrames of sensor data
+        """
+        clients = self.get_available_clients()
+        if len(clients) <= 1:
+            frames = [self.get_latest_data(c, time_range) for c in clients]
+        else:
+            workers = min(self.MAX_READ_WORKERS, len(clients))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                frames = list(executor.map(lambda c: self.get_latest_data(c, time_range), clients))
+
+        return {
+            client_id: df for client_id, df in zip(clients, frames)
+            if df is not None and not df.empty
+        }
+
+    def slice_since(self, df: pd.DataFrame, cutoff_date: Optional[datetime]) -> pd.DataFrame:
+        """
+        Return the rows of a timestamp-sorted DataFrame at or after cutoff_date.
+
+        Binary search (searchsorted) instead of a full boolean mask, so df
+        must already be sorted by timestamp.
+
+        Args:
+            df: DataFrame sorted by its 'timestamp' column
+            cutoff_date: Earliest timestamp to keep, or None for all rows
+
+        Returns:
+            Row slice of df (shares data with df)
+        """
+        if cutoff_date is None or "timestamp" not in df.columns:
+            return df
+        start = df["timestamp"].searchsorted(pd.Timestamp(cutoff_date), side="left")
+        return df.iloc[start:]
+
+    def flatten_readings(self, d: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Hoist a nested 'readings' dict into the top level of a sensor payload.
+
+        This is the only nested shape clients send ({'timestamp': ..., 'readings':
+        {...}}), so it is handled with one lookup and one dict merge instead of
+        type-checking every value as flatten_dict() does.
 
-        now = datetime.now()
-
-        try:
-            if time_range.endswith('h'):
-                hours = int(time_range[:-1])
-                return now - timedelta(hours=hours)
-            elif time_range.endswith('d'):
-                days = int(time_range[:-1])
-                return now - timedelta(days=days)
-            elif time_range.endswith('w'):
-                weeks = int(time_range[:-1])
-                return now - timedelta(weeks=weeks)
-        except (ValueError, IndexError):
-            logger.warning(f"Invalid time range format: {time_range}, defaulting to 3 days")
-            return now - timedelta(days=3)
-
-        # Default to 3 days if format not recognized
-        return now - timedelta(days=3)
+        Args:
+            d: Sensor payload
+
+        Returns:
+            Flattened payload, or d itself if it has no 'readings' dict
+        """
+        readings = d.get('readings')
+        if not isinstance(readings, dict):
+            return d
+        return {**{k: v for k, v in d.items() if k != 'readings'}, **readings}
 
     def flatten_dict(self, d: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -154,3 +302,22 @@ class SenseyStorage(ABC):
 class StorageError(Exception):
     """Exception raised for storage operation failures."""
     pass
+
+
+class BatchStoreError(StorageError):
+    """
+    Raised by store_batch() when only some clients' records were stored.
+
+    None of a failed client's records in the batch were written, and every
+    other client's were, so callers can retry just the failed clients.
+    """
+
+    def __init__(self, errors: Dict[str, Exception]):
+        """
+        Args:
+            errors: Mapping of failed client_id to the error it raised
+        """
+        self.errors = errors
+        self.failed_clients: Set[str] = set(errors)
+        details = "; ".join(f"{client_id}: {e}" for client_id, e in errors.items())
+        super().__init__(f"Failed to store batch for {len(errors)} client(s): {details}")
@@ -2,20 +2,34 @@
 CSV file-based storage implementation for Sensey sensor data.
 
 Each client gets its own CSV file in the data directory.
-Includes caching for improved read performance.
+Parsed files are kept in memory and only newly appended rows are parsed
+on later reads. The initial full parse uses pyarrow's CSV reader when it is
+installed.
 """
 
+import csv
+import io
 import os
-import glob
+import threading
 import pandas as pd
-from typing import List, Optional, Dict, Any
+from collections import OrderedDict
+from typing import List, Optional, Dict, Any, Tuple, Iterable
 from functools import lru_cache
 import logging
 
-from .base import SenseyStorage, StorageError
+from .base import SenseyStorage, StorageError, BatchStoreError
+from .locking import file_lock
 
 logger = logging.getLogger(__name__)
 
+# Try to import pyarrow (optional, multithreaded parsing of whole files)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 
 class CSVStorage(SenseyStorage):
     """
@@ -23,32 +37,63 @@ class CSVStorage(SenseyStorage):
 
     Features:
     - One CSV file per client (client_id.csv)
-    - LRU cache for improved read performance
-    - Automatic header management
+    - Incremental reads: appended bytes are parsed onto the cached frame
+    - Automatic header management, widened when new fields appear
     - Nested dictionary flattening support
     """
 
+    # Rows sampled to infer numeric columns in get_numeric_columns()
+    NUMERIC_SAMPLE_ROWS = 100
+
+    # Memory budget for parsed frames; least recently read files are dropped first
+    MAX_CACHED_BYTES = 512 * 1024 * 1024
+
     def __init__(self, data_dir: str = "data"):
         """
-        Initialize CSV storage backend.
+        Initialize CSV storage backend, creating the data directory if needed.
 
         Args:
             data_dir: Directory path for storing CSV files (default: "data")
         """
-        self.data_dir = data_dir
+        self.data_dir = os.fspath(data_dir)
+        os.makedirs(self.data_dir, exist_ok=True)
+        # Parsed, timestamp-sorted file contents, least recently read first:
+        # path -> (inode, bytes parsed, DataFrame, DataFrame size in bytes)
+        self._frames: "OrderedDict[str, Tuple[int, int, pd.DataFrame, int]]" = OrderedDict()
+        self._frames_bytes = 0
+        self._frames_lock = threading.Lock()  # Reads for several clients run on a thread pool
+        # Last client listing, keyed on the data directory's mtime
+        self._clients_cache: Optional[Tuple[int, List[str]]] = None
 
     def initialize(self) -> None:
-        """Create data directory if it doesn't exist."""
+        """Recreate the data directory if it was removed since construction."""
         os.makedirs(self.data_dir, exist_ok=True)
         logger.info(f"CSV storage initialized at {self.data_dir}")
 
     def get_available_clients(self) -> List[str]:
-        """Return list of clients based on CSV files in data directory."""
-        if not os.path.exists(self.data_dir):
+        """
+        Return list of clients based on CSV files in data directory.
+
+        Creating or removing a file changes the directory's mtime, so the
+        listing is only rescanned when that changes.
+        """
+        try:
+            dir_mtime = os.stat(self.data_dir).st_mtime_ns
+        except FileNotFoundError:
             return []
 
-        csv_files = glob.glob(os.path.join(self.data_dir, "*.csv"))
-        return sorted([os.path.basename(f).replace(".csv", "") for f in csv_files])
+        cached = self._clients_cache
+        if cached is not None and cached[0] == dir_mtime:
+            return list(cached[1])
+
+        with os.scandir(self.data_dir) as entries:
+            # Hidden files are skipped, as glob("*.csv") used to
+            clients = sorted(
+                e.name[:-4] for e in entries
+                if e.name.endswith(".csv") and not e.name.startswith(".")
+            )
+        self._clients_cache = (dir_mtime, clients)
+        return list(clients)
 
     def store_data(self, client_id: str, sensor_data: Dict[str, Any]) -> None:
         """
@@ -64,64 +109,84 @@ class CSVStorage(SenseyStorage):
         try:
             file_path = os.path.join(self.data_dir, f"{client_id}.csv")
 
-            # Flatten nested dictionaries if present
-            if 'readings' in sensor_data:
-                sensor_data = self.flatten_dict(sensor_data)
+            # Hoist nested readings if present
+            sensor_data = self.flatten_readings(sensor_data)
 
-            df = pd.DataFrame([sensor_data])
-
-            # Write header only if file is new
-            write_header = not os.path.exists(file_path)
-            df.to_csv(file_path, mode="a", index=False, header=write_header)
-
-            # Clear cache for this file since it's been modified
-            self._cached_read_csv.cache_clear()
+            self._append_rows(file_path, [sensor_data])
 
             logger.debug(f"Stored data for client {client_id}")
 
         except Exception as e:
             raise StorageError(f"Failed to store data for {client_id}: {e}")
 
+    def store_batch(self, records: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Append a batch of sensor readings, one file write per client.
+
+        A client whose write fails doesn't stop the others from being written.
+
+        Args:
+            records: Iterable of (client_id, sensor_data) tuples, oldest first
+
+        Raises:
+            BatchStoreError: Naming the clients whose rows could not be stored
+        """
+        # Group rows per client, keeping arrival order within each client
+        rows_by_client: Dict[str, List[Dict[str, Any]]] = {}
+        for client_id, sensor_data in records:
+            sensor_data = self.flatten_readings(sensor_data)
+            rows_by_client.setdefault(client_id, []).append(sensor_data)
+
+        errors: Dict[str, Exception] = {}
+        for client_id, rows in rows_by_client.items():
+            try:
+                file_path = os.path.join(self.data_dir, f"{client_id}.csv")
+                self._append_rows(file_path, rows)
+                logger.debug(f"Stored {len(rows)} records for client {client_id}")
+            except Exception as e:
+                errors[client_id] = e
+
+        if errors:
+            raise BatchStoreError(errors)
+
     def get_latest_data(
         self,
         client_id: str,
-        time_range: str = "3d"
+        time_range: str = "3d",
+        columns: Optional[List[str]] = None
     ) -> Optional[pd.DataFrame]:
         """
         Read and filter data for a specific client.
 
-        Uses caching based on file modification time for performance.
+        The file is parsed once; later calls only parse rows appended since.
+        Returned frames share data with that cache and must not be modified in place.
 
         Args:
             client_id: Unique identifier for the client
             time_range: Time range string (e.g., '1h', '6h', '1d', '3d', 'all')
+            columns: Columns to return (None for all); missing names are skipped
 
         Returns:
             DataFrame with sensor data, or None if no data exists
         """
         file_path = os.path.join(self.data_dir, f"{client_id}.csv")
 
-        if not os.path.exists(file_path):
-            logger.debug(f"No data file found for client {client_id}")
-            return None
-
         try:
-            # Use cached reading with file modification time as cache key
-            file_hash = self._get_file_hash(file_path)
-            df = self._cached_read_csv(file_path, file_hash)
-
-            if df is None or df.empty:
+            df = self._read_frame(file_path)
+            if df is None:
+                logger.debug(f"No data file found for client {client_id}")
+                return None
+            if df.empty:
                 return None
 
-            # Parse and sort by timestamp
-            if "timestamp" in df.columns:
-                df["timestamp"] = pd.to_datetime(df["timestamp"])
-                df = df.sort_values("timestamp")
+            # Shallow copy/projection, so callers adding columns don't touch the cache
+            if columns is not None:
+                df = df[[c for c in columns if c in df.columns]]
+            else:
+                df = df.copy(deep=False)
 
-            # Filter by time range
-            cutoff_date = self.parse_time_range(time_range)
-            if cutoff_date:
-                df = df[df["timestamp"] >= cutoff_date]
+            # Filter by time range; _read_frame keeps rows sorted by timestamp
+            df = self.slice_since(df, self.parse_time_range(time_range))
 
             logger.debug(f"Retrieved {len(df)} records for {client_id} (range: {time_range})")
             return df
@@ -143,50 +208,309 @@ class CSVStorage(SenseyStorage):
         Returns:
             Dictionary mapping client_id to DataFrame of sensor data
         """
-        all_data = {}
-        for client_id in self.get_available_clients():
-            df = self.get_latest_data(client_id, time_range)
-            if df is not None and not df.empty:
-                all_data[client_id] = df
+        # Each client is a separate file, so the reads run in parallel
+        all_data = self.read_clients_concurrently(time_range)
 
         logger.debug(f"Retrieved data for {len(all_data)} clients (range: {time_range})")
         return all_data
 
+    def get_data_version(self, client_id: str) -> Optional[Tuple[int, int]]:
+        """
+        Return the client file's (mtime_ns, size) as a data version token.
+
+        Every append changes the size, so this is a single stat() call.
+
+        Args:
+            client_id: Unique identifier for the client
+
+        Returns:
+            Tuple of (st_mtime_ns, st_size), or None if the client has no file
+        """
+        try:
+            st = os.stat(os.path.join(self.data_dir, f"{client_id}.csv"))
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def get_numeric_columns(self, client_id: str) -> Optional[List[str]]:
+        """
+        Infer the client's numeric columns from the first rows of its CSV file.
+
+        Args:
+            client_id: Unique identifier for the client
+
+        Returns:
+            List of numeric column names (excluding timestamp), or None if no file
+        """
+        file_path = os.path.join(self.data_dir, f"{client_id}.csv")
+
+        stat_key = self._stat_key(file_path)
+        if stat_key is None:
+            return None
+
+        try:
+            return self._cached_numeric_columns(file_path, stat_key)
+        except Exception as e:
+            logger.error(f"Failed to inspect columns for {client_id}: {e}")
+            return None
+
     def close(self) -> None:
         """Clear cache on shutdown."""
-        self._cached_read_csv.cache_clear()
+        with self._frames_lock:
+            self._frames.clear()
+            self._frames_bytes = 0
+        self._clients_cache = None
+        self._cached_numeric_columns.cache_clear()
         logger.info("CSV storage closed and cache cleared")
 
     # Helper methods
 
-    def _get_file_hash(self, file_path: str) -> str:
+    def _stat_key(self, file_path: str) -> Optional[Tuple[int, int, int]]:
         """
-        Get hash of file modification time for cache key.
+        Get a cache key for a file's current contents from a single stat().
+
+        Size catches appends within the same mtime tick; the inode catches a
+        rewrite with new columns.
 
         Args:
             file_path: Path to the CSV file
 
         Returns:
-            String representation of modification timestamp
+            Tuple of (st_ino, st_mtime_ns, st_size), or None if the file doesn't exist
+        """
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _append_rows(self, file_path: str, rows: List[Dict[str, Any]]) -> None:
         """
-        if not os.path.exists(file_path):
-            return "none"
-        return str(int(os.path.getmtime(file_path)))
+        Append rows to a CSV file with the csv module (no pandas on the write path).
 
-    @lru_cache(maxsize=32)
-    def _cached_read_csv(self, file_path: str, file_hash: str) -> Optional[pd.DataFrame]:
+        The rows are written under an exclusive file lock. A new file gets a
+        header with every key seen in rows, in first-seen order. An existing
+        file keeps its column order; if rows bring keys it doesn't have, the
+        file is rewritten once with those columns added (see _widen_file).
+
+        Args:
+            file_path: Path to the CSV file
+            rows: Flattened sensor readings to append
         """
-        Cached CSV reading function.
+        # Locked so other workers' appends (and a new file's header) don't interleave
+        with file_lock(file_path), open(file_path, "a+", newline="") as f:
+            f.seek(0)
+            header = next(csv.reader([f.readline()]), None)
+
+            if header:
+                known = set(header)
+                added = list(dict.fromkeys(k for row in rows for k in row if k not in known))
+                if added:
+                    self._widen_file(file_path, f, header, header + added, rows)
+                    return
+                fieldnames = header
+            else:
+                fieldnames = list(dict.fromkeys(k for row in rows for k in row))
+
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            if not header:
+                writer.writeheader()
+                # New client file: don't wait for the directory mtime to change
+                self._clients_cache = None
+            writer.writerows(rows)
+
+    def _widen_file(
+        self,
+        file_path: str,
+        f,
+        header: List[str],
+        fieldnames: List[str],
+        rows: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Rewrite a CSV file with extra columns, then append rows.
+
+        Existing rows are padded with empty values for the new columns. The
+        result is written to a temporary file and swapped in with os.replace,
+        so readers see either the old or the new file, and the new inode makes
+        every process's cached frame re-read it in full. Called with the file
+        lock held.
+
+        Args:
+            file_path: Path to the CSV file
+            f: The locked file, positioned after its header line
+            header: Current header
+            fieldnames: Widened header (current header plus new columns)
+            rows: Flattened sensor readings to append
+        """
+        logger.info(
+            f"Adding columns {fieldnames[len(header):]} to {file_path}"
+        )
+        padding = [""] * (len(fieldnames) - len(header))
+
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, "w", newline="") as out:
+            writer = csv.writer(out)
+            writer.writerow(fieldnames)
+            writer.writerows(row + padding for row in csv.reader(f) if row)
+            csv.DictWriter(out, fieldnames=fieldnames).writerows(rows)
+        os.replace(tmp_path, file_path)
+
+    def _read_frame(self, file_path: str) -> Optional[pd.DataFrame]:
+        """
+        Return the parsed, timestamp-sorted contents of a CSV file.
 
-        Cache key includes file_hash (mtime) to invalidate when file changes.
+        Files are append-only, so the parsed frame is kept together with the
+        number of bytes it covers; when the file has grown only the new bytes
+        are parsed and concatenated. A changed inode (file replaced) or a
+        smaller size (file truncated) triggers a full re-read. Frames are
+        evicted least recently read first once they exceed MAX_CACHED_BYTES.
 
         Args:
             file_path: Path to the CSV file
-            file_hash: File modification hash for cache invalidation
 
         Returns:
-            DataFrame with CSV contents, or None if file doesn't exist
+            DataFrame with the file's complete rows, or None if the file doesn't exist
         """
-        if not os.path.exists(file_path):
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            self._drop_frame(file_path)
             return None
-        return pd.read_csv(file_path)
+
+        cached = self._frames.get(file_path)
+        if cached is not None:
+            inode, offset, df, _ = cached
+            if inode == st.st_ino and offset == st.st_size:
+                with self._frames_lock:
+                    if file_path in self._frames:
+                        self._frames.move_to_end(file_path)
+                return df
+            if inode != st.st_ino or st.st_size < offset:
+                cached = None
+
+        offset = cached[1] if cached is not None else 0
+        with open(file_path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+
+        # Only parse complete lines; a row still being written is picked up next time
+        end = data.rfind(b"\n") + 1
+        if end == 0:
+            return cached[2] if cached is not None else pd.DataFrame()
+
+        if cached is None:
+            df = self._parse_rows(self._read_csv_bytes(data[:end]))
+            nbytes = self._frame_bytes(df)
+        else:
+            df = cached[2]
+            tail = self._parse_rows(
+                pd.read_csv(io.BytesIO(data[:end]), header=None, names=list(df.columns))
+            )
+            # Only the new rows are measured; the cached part was measured when stored
+            nbytes = cached[3] + self._frame_bytes(tail)
+            df = pd.concat([df, tail], ignore_index=True)
+            if "timestamp" in df.columns and not df["timestamp"].is_monotonic_increasing:
+                df = df.sort_values("timestamp", kind="stable", ignore_index=True)
+
+        self._store_frame(file_path, st.st_ino, offset + end, df, nbytes)
+        return df
+
+    @staticmethod
+    def _frame_bytes(df: pd.DataFrame) -> int:
+        """Return a frame's memory use, including the string data of object columns."""
+        return int(df.memory_usage(index=True, deep=True).sum())
+
+    def _store_frame(
+        self,
+        file_path: str,
+        inode: int,
+        offset: int,
+        df: pd.DataFrame,
+        nbytes: int
+    ) -> None:
+        """
+        Cache a parsed frame as most recently read and evict down to MAX_CACHED_BYTES.
+
+        The frame just stored is never evicted, so a single file larger than
+        the budget is still cached (alone).
+
+        Args:
+            file_path: Path to the CSV file
+            inode: Inode of the file that was parsed
+            offset: Number of bytes the frame covers
+            df: Parsed frame
+            nbytes: Memory use of df (see _frame_bytes)
+        """
+        with self._frames_lock:
+            old = self._frames.pop(file_path, None)
+            if old is not None:
+                self._frames_bytes -= old[3]
+            self._frames[file_path] = (inode, offset, df, nbytes)
+            self._frames_bytes += nbytes
+
+            while self._frames_bytes > self.MAX_CACHED_BYTES and len(self._frames) > 1:
+                evicted_path, evicted = self._frames.popitem(last=False)
+                self._frames_bytes -= evicted[3]
+                logger.debug(f"Evicted cached frame for {evicted_path} ({evicted[3]} bytes)")
+
+    def _drop_frame(self, file_path: str) -> None:
+        """Remove a file's cached frame, if any."""
+        with self._frames_lock:
+            old = self._frames.pop(file_path, None)
+            if old is not None:
+                self._frames_bytes -= old[3]
+
+    def _read_csv_bytes(self, data: bytes) -> pd.DataFrame:
+        """
+        Parse a whole CSV file (header included).
+
+        Uses pyarrow's multithreaded reader when installed, which also parses
+        the timestamp column, and falls back to pandas otherwise or when
+        pyarrow rejects the file (e.g. a row with fewer fields than the header,
+        which pandas pads with NaN).
+
+        Args:
+            data: File contents, ending on a complete line
+
+        Returns:
+            DataFrame with the parsed rows, numpy-backed dtypes
+        """
+        if PYARROW_AVAILABLE:
+            try:
+                table = pa_csv.read_csv(
+                    io.BytesIO(data),
+                    read_options=pa_csv.ReadOptions(use_threads=True)
+                )
+                return table.to_pandas(coerce_temporal_nanoseconds=True, self_destruct=True)
+            except pa.ArrowInvalid as e:
+                logger.debug(f"pyarrow could not parse CSV, using pandas: {e}")
+        return pd.read_csv(io.BytesIO(data))
+
+    def _parse_rows(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Parse timestamps and sort rows read from a CSV file."""
+        if "timestamp" in df.columns:
+            if not pd.api.types.is_datetime64_any_dtype(df["timestamp"]):
+                df["timestamp"] = pd.to_datetime(df["timestamp"])
+            df = df.sort_values("timestamp", kind="stable", ignore_index=True)
+        return df
+
+    @lru_cache(maxsize=32)
+    def _cached_numeric_columns(
+        self,
+        file_path: str,
+        stat_key: Tuple[int, int, int]
+    ) -> List[str]:
+        """
+        Cached numeric column inference from a sample of the file's rows.
+
+        Args:
+            file_path: Path to the CSV file
+            stat_key: File stat key (see _stat_key) for cache invalidation
+
+        Returns:
+            List of numeric column names (excluding timestamp)
+        """
+        sample = pd.read_csv(file_path, nrows=self.NUMERIC_SAMPLE_ROWS)
+        numeric = sample.select_dtypes(include=['number']).columns
+        return [c for c in numeric if c != "timestamp"]
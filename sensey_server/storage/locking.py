@@ -0,0 +1,27 @@
+"""
+Inter-process file locking for the file-based storage backends.
+
+Under gunicorn several worker processes append to the same client files;
+an exclusive flock() around each write keeps their rows (and headers) from
+interleaving. Locks are taken on a sidecar "<file>.lock" so they stay
+valid when the data file itself is replaced.
+"""
+
+import fcntl
+from contextlib import contextmanager
+
+
+@contextmanager
+def file_lock(file_path: str):
+    """
+    Hold an exclusive lock for a data file while the block runs.
+
+    Args:
+        file_path: Path of the data file to lock (the lock file is file_path + ".lock")
+    """
+    with open(file_path + ".lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
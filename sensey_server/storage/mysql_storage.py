@@ -11,12 +11,13 @@ Hybrid Schema Design:
 """
 
 import json
+import re
 import pandas as pd
-from typing import List, Optional, Dict, Any, Set
+from typing import List, Optional, Dict, Any, Set, Tuple, Iterable
 from datetime import datetime
 import logging
 
-from .base import SenseyStorage, StorageError
+from .base import SenseyStorage, StorageError, BatchStoreError
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +31,37 @@ except ImportError:
     MYSQL_AVAILABLE = False
     logger.warning("mysql-connector-python not installed, MySQL storage unavailable")
 
+# Try to import orjson (optional, faster encoding/decoding of the readings JSON)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _dumps_readings(data: Dict[str, Any]) -> str:
+    """
+    Serialize a readings dict for the JSON column.
+
+    Returns str, not orjson's bytes: MySQL rejects JSON sent as a binary string.
+    Values orjson can't encode fall back to the stdlib encoder.
+
+    Args:
+        data: Non-fixed sensor readings
+
+    Returns:
+        JSON text
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        except TypeError:
+            pass
+    return json.dumps(data)
+
+
+_loads_readings = orjson.loads if ORJSON_AVAILABLE else json.loads
+
 
 class MySQLStorage(SenseyStorage):
     """
@@ -59,6 +91,12 @@ class MySQLStorage(SenseyStorage):
     # Define which fields get their own columns vs going into JSON
     FIXED_COLUMNS = {'temperature', 'humidity'}
 
+    # Most recent rows inspected by get_numeric_columns()
+    NUMERIC_SAMPLE_ROWS = 100
+
+    # JSON keys that can be projected server-side with JSON_VALUE (safe to inline in SQL)
+    _JSON_KEY_RE = re.compile(r"\A[A-Za-z_][A-Za-z0-9_]*\Z")
+
     def __init__(
         self,
         host: str = "localhost",
@@ -100,11 +138,14 @@ class MySQLStorage(SenseyStorage):
             'autocommit': False,
             'pool_name': pool_name,
             'pool_size': pool_size,
-            'pool_reset_session': True
+            'pool_reset_session': True,
+            # C extension protocol parser; the connector falls back to pure Python if it isn't built
+            'use_pure': False
         }
         self.database = database
         self.table_name = table_name
         self.pool: Optional[MySQLConnectionPool] = None
+        self._build_queries()
 
     def initialize(self) -> None:
         """
@@ -190,9 +231,7 @@ class MySQLStorage(SenseyStorage):
         cursor = conn.cursor()
 
         try:
-            cursor.execute(
-                f"SELECT DISTINCT client_id FROM `{self.table_name}` ORDER BY client_id"
-            )
+            cursor.execute(self._sql_clients)
             clients = [row[0] for row in cursor.fetchall()]
             logger.debug(f"Found {len(clients)} clients in database")
             return clients
@@ -218,61 +257,77 @@ class MySQLStorage(SenseyStorage):
         Raises:
             StorageError: If data cannot be stored
         """
+        # Same fixed five-column layout as store_batch, so one prebuilt INSERT serves both
+        row = self._row_values(client_id, sensor_data)
+
         conn = self.pool.get_connection()
         cursor = conn.cursor()
 
         try:
-            # Flatten nested dictionaries
-            if 'readings' in sensor_data:
-                sensor_data = self.flatten_dict(sensor_data)
-
-            # Prepare timestamp
-            if 'timestamp' not in sensor_data:
-                timestamp = datetime.now()
-            elif isinstance(sensor_data['timestamp'], str):
-                timestamp = pd.to_datetime(sensor_data['timestamp']).to_pydatetime()
-            else:
-                timestamp = sensor_data['timestamp']
+            cursor.execute(self._sql_insert, row)
+            conn.commit()
+            logger.debug(f"Stored data for client {client_id}")
 
-            # Split data into fixed columns and JSON
-            fixed_data = {}
-            json_data = {}
+        except MySQLError as e:
+            conn.rollback()
+            raise StorageError(f"Failed to store data for {client_id}: {e}")
+        finally:
+            cursor.close()
+            conn.close()
 
-            for key, value in sensor_data.items():
-                if key == 'timestamp':
-                    continue  # handled separately
-                elif key in self.FIXED_COLUMNS:
-                    fixed_data[key] = value
-                else:
-                    json_data[key] = value
+    def store_batch(self, records: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Insert a batch of sensor readings with one executemany() and one commit.
 
-            # Build INSERT query
-            columns = ['client_id', 'timestamp']
-            values = [client_id, timestamp]
+        Every row is written with the same five columns (missing measurements
+        as NULL, matching the column defaults), so the connector can send the
+        whole batch as a single multi-row INSERT.
 
-            # Add fixed columns
-            for col in self.FIXED_COLUMNS:
-                if col in fixed_data:
-                    columns.append(col)
-                    values.append(fixed_data[col])
+        A client with a record that can't be converted (e.g. a bad timestamp)
+        is left out of the INSERT entirely, so a retry doesn't duplicate rows.
 
-            # Add JSON column if there's additional data
-            if json_data:
-                columns.append('readings')
-                values.append(json.dumps(json_data))
+        Args:
+            records: Iterable of (client_id, sensor_data) tuples, oldest first
 
-            placeholders = ', '.join(['%s'] * len(columns))
-            column_names = ', '.join([f"`{col}`" for col in columns])
+        Raises:
+            BatchStoreError: Naming the clients whose records could not be converted
+            StorageError: If the INSERT fails (nothing is stored)
+        """
+        values = []
+        errors: Dict[str, Exception] = {}
+        for client_id, sensor_data in records:
+            try:
+                values.append((client_id, self._row_values(client_id, sensor_data)))
+            except Exception as e:
+                errors.setdefault(client_id, e)
+
+        rows = [row for client_id, row in values if client_id not in errors]
+        if rows:
+            self._insert_rows(rows)
+        if errors:
+            raise BatchStoreError(errors)
+
+    def _insert_rows(self, rows: List[Tuple]) -> None:
+        """
+        Insert prepared rows with one executemany() and one commit.
 
-            query = f"INSERT INTO `{self.table_name}` ({column_names}) VALUES ({placeholders})"
+        Args:
+            rows: Value tuples from _row_values()
 
-            cursor.execute(query, values)
+        Raises:
+            StorageError: If the rows cannot be stored (the batch is rolled back)
+        """
+        conn = self.pool.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.executemany(self._sql_insert, rows)
             conn.commit()
-            logger.debug(f"Stored data for client {client_id} (fixed: {list(fixed_data.keys())}, json: {list(json_data.keys())})")
+            logger.debug(f"Stored batch of {len(rows)} records")
 
         except MySQLError as e:
             conn.rollback()
-            raise StorageError(f"Failed to store data for {client_id}: {e}")
+            raise StorageError(f"Failed to store batch of {len(rows)} records: {e}")
         finally:
             cursor.close()
             conn.close()
@@ -280,16 +335,21 @@ class MySQLStorage(SenseyStorage):
     def get_latest_data(
         self,
         client_id: str,
-        time_range: str = "3d"
+        time_range: str = "3d",
+        columns: Optional[List[str]] = None
     ) -> Optional[pd.DataFrame]:
         """
         Query sensor data for a specific client.
 
         Merges fixed columns and JSON data into a single DataFrame.
+        When columns is given, only the fixed columns requested are selected,
+        and requested JSON keys are extracted server-side as numbers, so the
+        readings blob isn't sent at all.
 
         Args:
             client_id: Unique identifier for the client
             time_range: Time range string (e.g., '1h', '6h', '1d', '3d', 'all')
+            columns: Columns to return (None for all)
 
         Returns:
             DataFrame with sensor data, or None if no data exists
@@ -298,23 +358,14 @@ class MySQLStorage(SenseyStorage):
 
         try:
             cutoff_date = self.parse_time_range(time_range)
+            select = self._select_list(columns)
 
             if cutoff_date:
-                query = f"""
-                    SELECT timestamp, temperature, humidity, readings
-                    FROM `{self.table_name}`
-                    WHERE client_id = %s AND timestamp >= %s
-                    ORDER BY timestamp ASC
-                """
-                df = pd.read_sql(query, conn, params=(client_id, cutoff_date))
+                query = self._sql_client_since.format(select=select)
+                df = self._query_frame(conn, query, (client_id, cutoff_date))
             else:
-                query = f"""
-                    SELECT timestamp, temperature, humidity, readings
-                    FROM `{self.table_name}`
-                    WHERE client_id = %s
-                    ORDER BY timestamp ASC
-                """
-                df = pd.read_sql(query, conn, params=(client_id,))
+                query = self._sql_client_all.format(select=select)
+                df = self._query_frame(conn, query, (client_id,))
 
             if df.empty:
                 logger.debug(f"No data found for client {client_id}")
@@ -323,10 +374,19 @@ class MySQLStorage(SenseyStorage):
             # Expand JSON column into separate columns
             df = self._expand_json_column(df)
 
-            # Convert timestamp to datetime if needed
+            # Convert timestamp to datetime if needed (before any column subset is taken,
+            # so this never assigns into a slice of another frame)
             if 'timestamp' in df.columns:
                 df['timestamp'] = pd.to_datetime(df['timestamp'])
 
+            if columns is not None:
+                # A JSON key no row has comes back all NULL; drop it like an unknown column
+                df = df[[
+                    c for c in df.columns
+                    if c in columns
+                    and (c == 'timestamp' or c in self.FIXED_COLUMNS or df[c].notna().any())
+                ]]
+
             logger.debug(f"Retrieved {len(df)} records for {client_id} (range: {time_range})")
             return df
 
@@ -336,6 +396,45 @@ class MySQLStorage(SenseyStorage):
         finally:
             conn.close()
 
+    def get_numeric_columns(self, client_id: str) -> Optional[List[str]]:
+        """
+        Infer the client's numeric columns from its most recent rows.
+
+        Fixed columns count if any sampled row has a value; JSON keys count
+        if any sampled row holds a number for them. The charts route passes
+        the result to get_latest_data(), which then extracts those keys with
+        JSON_VALUE instead of fetching every readings blob.
+
+        Args:
+            client_id: Unique identifier for the client
+
+        Returns:
+            List of numeric column names (excluding timestamp), or None if no data or on error
+        """
+        conn = self.pool.get_connection()
+
+        try:
+            df = self._query_frame(
+                conn, self._sql_numeric_sample, (client_id, self.NUMERIC_SAMPLE_ROWS)
+            )
+        except MySQLError as e:
+            logger.error(f"Failed to inspect columns for {client_id}: {e}")
+            return None
+        finally:
+            conn.close()
+
+        if df.empty:
+            return None
+
+        columns = [c for c in ('temperature', 'humidity') if df[c].notna().any()]
+        json_keys: Dict[str, None] = {}  # insertion-ordered set
+        for value in df['readings'].tolist():
+            for key, reading in self._parse_readings(value).items():
+                if isinstance(reading, (int, float)) and not isinstance(reading, bool):
+                    json_keys.setdefault(key, None)
+        columns.extend(k for k in json_keys if k not in columns)
+        return columns
+
     def get_all_clients_data(
         self,
         time_range: str = "3d"
@@ -355,25 +454,17 @@ class MySQLStorage(SenseyStorage):
             cutoff_date = self.parse_time_range(time_range)
 
             if cutoff_date:
-                query = f"""
-                    SELECT client_id, timestamp, temperature, humidity, readings
-                    FROM `{self.table_name}`
-                    WHERE timestamp >= %s
-                    ORDER BY client_id, timestamp ASC
-                """
-                df = pd.read_sql(query, conn, params=(cutoff_date,))
+                df = self._query_frame(conn, self._sql_all_clients_since, (cutoff_date,))
             else:
-                query = f"""
-                    SELECT client_id, timestamp, temperature, humidity, readings
-                    FROM `{self.table_name}`
-                    ORDER BY client_id, timestamp ASC
-                """
-                df = pd.read_sql(query, conn)
+                df = self._query_frame(conn, self._sql_all_clients_all)
 
             if df.empty:
                 logger.debug("No data found for any clients")
                 return {}
 
+            # One small code per row instead of a repeated string; groupby then works on the codes
+            df['client_id'] = df['client_id'].astype('category')
+
             # Expand JSON column
             df = self._expand_json_column(df)
 
@@ -381,11 +472,11 @@ class MySQLStorage(SenseyStorage):
             if 'timestamp' in df.columns:
                 df['timestamp'] = pd.to_datetime(df['timestamp'])
 
-            # Split by client_id
-            all_data = {}
-            for client_id in df['client_id'].unique():
-                client_df = df[df['client_id'] == client_id].drop('client_id', axis=1).reset_index(drop=True)
-                all_data[client_id] = client_df
+            # Split by client_id in one pass (rows are already ordered by client)
+            all_data = {
+                client_id: group.drop(columns='client_id').reset_index(drop=True)
+                for client_id, group in df.groupby('client_id', sort=False, observed=True)
+            }
 
             logger.debug(f"Retrieved data for {len(all_data)} clients (range: {time_range})")
             return all_data
@@ -396,6 +487,34 @@ class MySQLStorage(SenseyStorage):
         finally:
             conn.close()
 
+    def get_data_version(self, client_id: str) -> Optional[Tuple[int, Any]]:
+        """
+        Return (row count, latest timestamp) for a client as a data version token.
+
+        Both aggregates are answered from the (client_id, timestamp) index,
+        so this is far cheaper than fetching the rows themselves.
+
+        Args:
+            client_id: Unique identifier for the client
+
+        Returns:
+            Tuple of (count, max timestamp), or None if no data or on error
+        """
+        conn = self.pool.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(self._sql_version, (client_id,))
+            count, latest = cursor.fetchone()
+            return (count, latest) if count else None
+
+        except MySQLError as e:
+            logger.error(f"Failed to get data version for {client_id}: {e}")
+            return None
+        finally:
+            cursor.close()
+            conn.close()
+
     def close(self) -> None:
         """
         Close connection pool.
@@ -408,6 +527,133 @@ class MySQLStorage(SenseyStorage):
 
     # Helper methods
 
+    def _build_queries(self) -> None:
+        """
+        Build the SQL statements once; only the table name varies and it is fixed at init.
+
+        The per-client SELECTs keep a {select} slot for the projection list.
+        """
+        table = f"`{self.table_name}`"
+        self._sql_insert = (
+            f"INSERT INTO {table} "
+            f"(`client_id`, `timestamp`, `temperature`, `humidity`, `readings`) "
+            f"VALUES (%s, %s, %s, %s, %s)"
+        )
+        self._sql_clients = f"SELECT DISTINCT client_id FROM {table} ORDER BY client_id"
+        self._sql_version = (
+            f"SELECT COUNT(*), MAX(timestamp) FROM {table} WHERE client_id = %s"
+        )
+        self._sql_numeric_sample = (
+            f"SELECT temperature, humidity, readings FROM {table} "
+            f"WHERE client_id = %s ORDER BY timestamp DESC LIMIT %s"
+        )
+        self._sql_client_since = (
+            f"SELECT {{select}} FROM {table} "
+            f"WHERE client_id = %s AND timestamp >= %s ORDER BY timestamp ASC"
+        )
+        self._sql_client_all = (
+            f"SELECT {{select}} FROM {table} "
+            f"WHERE client_id = %s ORDER BY timestamp ASC"
+        )
+        self._sql_all_clients_since = (
+            f"SELECT client_id, timestamp, temperature, humidity, readings FROM {table} "
+            f"WHERE timestamp >= %s ORDER BY client_id, timestamp ASC"
+        )
+        self._sql_all_clients_all = (
+            f"SELECT client_id, timestamp, temperature, humidity, readings FROM {table} "
+            f"ORDER BY client_id, timestamp ASC"
+        )
+
+    def _row_values(self, client_id: str, sensor_data: Dict[str, Any]) -> Tuple[Any, ...]:
+        """
+        Convert a reading into (client_id, timestamp, temperature, humidity, readings).
+
+        Fixed columns get their own values, everything else goes into the JSON
+        readings value (None if there is nothing extra).
+
+        Args:
+            client_id: Unique identifier for the client
+            sensor_data: Dictionary containing sensor readings and timestamp
+
+        Returns:
+            Tuple of values for the five insert columns
+        """
+        sensor_data = self.flatten_readings(sensor_data)
+
+        if 'timestamp' not in sensor_data:
+            timestamp = datetime.now()
+        elif isinstance(sensor_data['timestamp'], str):
+            timestamp = pd.to_datetime(sensor_data['timestamp']).to_pydatetime()
+        else:
+            timestamp = sensor_data['timestamp']
+
+        json_data = {
+            key: value for key, value in sensor_data.items()
+            if key != 'timestamp' and key not in self.FIXED_COLUMNS
+        }
+
+        return (
+            client_id,
+            timestamp,
+            sensor_data.get('temperature'),
+            sensor_data.get('humidity'),
+            _dumps_readings(json_data) if json_data else None,
+        )
+
+    def _query_frame(self, conn, query: str, params: Tuple[Any, ...] = ()) -> pd.DataFrame:
+        """
+        Run a SELECT and build a DataFrame straight from the fetched rows.
+
+        Skips pd.read_sql, which only supports SQLAlchemy and sqlite3
+        connections and goes through its generic (and warning) fallback for a
+        raw mysql-connector connection.
+
+        Args:
+            conn: Pooled connection
+            query: SELECT statement with %s placeholders
+            params: Query parameters
+
+        Returns:
+            DataFrame with one column per selected column
+        """
+        cursor = conn.cursor()
+        try:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            return pd.DataFrame.from_records(
+                rows, columns=list(cursor.column_names), coerce_float=True
+            )
+        finally:
+            cursor.close()
+
+    def _select_list(self, columns: Optional[List[str]]) -> str:
+        """
+        Build the SELECT column list for a projection request.
+
+        Args:
+            columns: Requested column names, or None for all
+
+        Returns:
+            Comma-separated column list for the query
+        """
+        if columns is None:
+            return "timestamp, temperature, humidity, readings"
+
+        select = ['timestamp']
+        select.extend(c for c in ('temperature', 'humidity') if c in columns)
+
+        json_keys = [c for c in columns if c not in self.FIXED_COLUMNS and c != 'timestamp']
+        if all(self._JSON_KEY_RE.match(k) for k in json_keys):
+            # Chart projections are numeric; non-numeric values come back NULL
+            select.extend(
+                f"JSON_VALUE(readings, '$.{k}' RETURNING DOUBLE NULL ON EMPTY NULL ON ERROR) AS `{k}`"
+                for k in json_keys
+            )
+        else:
+            # Unusual key names: fetch the blob and expand it in Python
+            select.append('readings')
+        return ", ".join(select)
+
     def _expand_json_column(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Expand the JSON 'readings' column into separate columns.
@@ -421,27 +667,30 @@ class MySQLStorage(SenseyStorage):
         if 'readings' not in df.columns:
             return df
 
-        # Parse JSON and expand into columns
-        json_expanded = []
-        for idx, row in df.iterrows():
-            if pd.notna(row['readings']) and row['readings']:
-                try:
-                    if isinstance(row['readings'], str):
-                        json_data = json.loads(row['readings'])
-                    else:
-                        json_data = row['readings']
-                    json_expanded.append(json_data)
-                except (json.JSONDecodeError, TypeError):
-                    json_expanded.append({})
-            else:
-                json_expanded.append({})
+        # One pass over the column values (no iterrows), one DataFrame build
+        json_df = pd.DataFrame.from_records(
+            [self._parse_readings(value) for value in df['readings'].tolist()],
+            index=df.index
+        )
 
-        # Convert to DataFrame and merge
-        if json_expanded:
-            json_df = pd.DataFrame(json_expanded)
-            # Drop the original readings column
-            df = df.drop('readings', axis=1)
-            # Concatenate with expanded JSON data
-            df = pd.concat([df, json_df], axis=1)
+        return pd.concat([df.drop(columns='readings'), json_df], axis=1)
+
+    @staticmethod
+    def _parse_readings(value: Any) -> Dict[str, Any]:
+        """
+        Decode one 'readings' JSON value.
 
-        return df
+        Args:
+            value: JSON string/bytes from MySQL, an already-decoded dict, or NULL
+
+        Returns:
+            Dictionary of readings ({} for NULL, empty or invalid values)
+        """
+        if isinstance(value, dict):
+            return value
+        if not value or not isinstance(value, (str, bytes, bytearray)):
+            return {}
+        try:
+            return _loads_readings(value)
+        except (ValueError, TypeError):
+            return {}
@@ -0,0 +1,631 @@
+"""
+Parquet file-based storage implementation for Sensey sensor data.
+
+Each client gets its own Parquet file in the data directory. Compared to CSV,
+readings are stored as typed binary columns (timestamps as timestamp[ns], values
+as float/int), so reads skip text tokenization and pd.to_datetime entirely and
+can load just the columns a chart needs.
+
+Parquet files can't be appended to in place, so writes don't touch the
+client's main file. Each flush (see sensey_data.queue_data) writes its rows to
+a new small part file in "<client_id>.parts/", and once COMPACT_PARTS of them
+have piled up they are merged into the main file, which is replaced
+atomically. The main file records which parts it has absorbed, so readers
+never count a row twice if compaction is interrupted before those parts are
+deleted. A per-client file lock keeps compactions in other worker processes
+from overwriting each other's rows.
+"""
+
+import json
+import os
+import time
+from itertools import count
+from bisect import bisect_left
+import pandas as pd
+from typing import List, Optional, Dict, Any, Tuple, Iterable
+from functools import lru_cache
+import logging
+
+from .base import SenseyStorage, StorageError, BatchStoreError
+from .locking import file_lock
+
+logger = logging.getLogger(__name__)
+
+# Try to import pyarrow (Parquet engine for pandas)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    logger.warning("pyarrow not installed, Parquet storage unavailable")
+
+
+class ParquetStorage(SenseyStorage):
+    """
+    Parquet file-based storage implementation.
+
+    Features:
+    - One Parquet file per client (client_id.parquet), sorted by timestamp,
+      plus append-only part files (client_id.parts/) compacted into it
+    - Typed columnar storage: no re-parsing on read
+    - Column projection for chart reads
+    - Row groups skipped by timestamp statistics for narrow time ranges
+    - LRU cache keyed on file version for repeated reads
+    - Nested dictionary flattening support
+    """
+
+    # Rows per Parquet row group; the unit of time-range pruning on read
+    ROW_GROUP_SIZE = 65536
+
+    # Part files a client may accumulate before they are merged into its main file
+    COMPACT_PARTS = 64
+
+    # Main-file schema metadata key listing the part files merged into it
+    MERGED_PARTS_KEY = b"sensey.merged_parts"
+
+    def __init__(self, data_dir: str = "data"):
+        """
+        Initialize Parquet storage backend.
+
+        Args:
+            data_dir: Directory path for storing Parquet files (default: "data")
+        """
+        if not PYARROW_AVAILABLE:
+            raise StorageError(
+                "pyarrow not installed. "
+                "Install with: pip install pyarrow"
+            )
+
+        self.data_dir = data_dir
+        # Last client listing, keyed on the data directory's mtime
+        self._clients_cache: Optional[Tuple[int, List[str]]] = None
+        # Makes part file names unique within this process
+        self._part_seq = count()
+
+    def initialize(self) -> None:
+        """Create data directory if it doesn't exist."""
+        os.makedirs(self.data_dir, exist_ok=True)
+        logger.info(f"Parquet storage initialized at {self.data_dir}")
+
+    def get_available_clients(self) -> List[str]:
+        """
+        Return list of clients based on Parquet files and part directories in data directory.
+
+        The listing is only rescanned when the directory's mtime changes.
+        """
+        try:
+            dir_mtime = os.stat(self.data_dir).st_mtime_ns
+        except FileNotFoundError:
+            return []
+
+        cached = self._clients_cache
+        if cached is not None and cached[0] == dir_mtime:
+            return list(cached[1])
+
+        with os.scandir(self.data_dir) as entries:
+            clients = sorted({
+                e.name.rsplit(".", 1)[0] for e in entries
+                if not e.name.startswith(".")
+                and (e.name.endswith(".parquet") or (e.name.endswith(".parts") and e.is_dir()))
+            })
+        self._clients_cache = (dir_mtime, clients)
+        return list(clients)
+
+    def store_data(self, client_id: str, sensor_data: Dict[str, Any]) -> None:
+        """
+        Store a single sensor reading.
+
+        Args:
+            client_id: Unique identifier for the client
+            sensor_data: Dictionary containing sensor readings and timestamp
+
+        Raises:
+            StorageError: If data cannot be stored
+        """
+        self.store_batch([(client_id, sensor_data)])
+
+    def store_batch(self, records: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Store a batch of sensor readings, one new part file per client.
+
+        A client whose write fails doesn't stop the others from being written.
+
+        Args:
+            records: Iterable of (client_id, sensor_data) tuples, oldest first
+
+        Raises:
+            BatchStoreError: Naming the clients whose rows could not be stored
+        """
+        # Group rows per client, keeping arrival order within each client
+        rows_by_client: Dict[str, List[Dict[str, Any]]] = {}
+        for client_id, sensor_data in records:
+            sensor_data = self.flatten_readings(sensor_data)
+            rows_by_client.setdefault(client_id, []).append(sensor_data)
+
+        errors: Dict[str, Exception] = {}
+        for client_id, rows in rows_by_client.items():
+            try:
+                self._append_rows(client_id, pd.DataFrame(rows))
+                logger.debug(f"Stored {len(rows)} records for client {client_id}")
+            except Exception as e:
+                errors[client_id] = e
+
+        # Clear cache once for the whole batch
+        if rows_by_client:
+            self._cached_read_client.cache_clear()
+            self._cached_row_group_max.cache_clear()
+
+        if errors:
+            raise BatchStoreError(errors)
+
+    def get_latest_data(
+        self,
+        client_id: str,
+        time_range: str = "3d",
+        columns: Optional[List[str]] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Read and filter data for a specific client.
+
+        Args:
+            client_id: Unique identifier for the client
+            time_range: Time range string (e.g., '1h', '6h', '1d', '3d', 'all')
+            columns: Columns to read (None for all); missing names are skipped
+
+        Returns:
+            DataFrame with sensor data, or None if no data exists
+        """
+        file_path = self._file_path(client_id)
+
+        # A compaction in another process may delete parts between listing and
+        # reading them; the second listing then finds their rows in the main file
+        for attempt in range(2):
+            version = self._client_version(client_id)
+            if version is None:
+                logger.debug(f"No data file found for client {client_id}")
+                return None
+
+            try:
+                cutoff_date = self.parse_time_range(time_range)
+                usecols = tuple(columns) if columns is not None else None
+                first_group = (
+                    self._first_row_group(file_path, version[0], cutoff_date)
+                    if version[0] is not None else 0
+                )
+                df = self._cached_read_client(client_id, version, usecols, first_group)
+                break
+
+            except FileNotFoundError as e:
+                if attempt:
+                    logger.error(f"Failed to read data for {client_id}: {e}")
+                    return None
+            except Exception as e:
+                logger.error(f"Failed to read data for {client_id}: {e}")
+                return None
+
+        if df is None or df.empty:
+            return None
+
+        # Rows are sorted once per version, so the rest of the range is a binary search.
+        # Shallow copy/projection, so callers adding columns don't touch the cache
+        df = self.slice_since(df.copy(deep=False), cutoff_date)
+
+        logger.debug(f"Retrieved {len(df)} records for {client_id} (range: {time_range})")
+        return df
+
+    def get_all_clients_data(
+        self,
+        time_range: str = "3d"
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Retrieve data for all clients within a specified time range.
+
+        Args:
+            time_range: Time range string (e.g., '1h', '6h', '1d', '3d', 'all')
+
+        Returns:
+            Dictionary mapping client_id to DataFrame of sensor data
+        """
+        # Each client is a separate file, so the reads run in parallel
+        all_data = self.read_clients_concurrently(time_range)
+
+        logger.debug(f"Retrieved data for {len(all_data)} clients (range: {time_range})")
+        return all_data
+
+    def get_data_version(self, client_id: str) -> Optional[Tuple[Any, Tuple[str, ...]]]:
+        """
+        Return the client's main file version and part file names as a data version token.
+
+        Every write adds a part file and every compaction replaces the main
+        file, so this is one stat() plus one listing of the parts directory.
+
+        Args:
+            client_id: Unique identifier for the client
+
+        Returns:
+            Tuple of ((st_mtime_ns, st_size) or None, part names), or None if the client has no data
+        """
+        return self._client_version(client_id)
+
+    def get_numeric_columns(self, client_id: str) -> Optional[List[str]]:
+        """
+        Return the client's numeric columns from the Parquet schemas.
+
+        Only the file footers are read (main file and parts), no row data.
+
+        Args:
+            client_id: Unique identifier for the client
+
+        Returns:
+            List of numeric column names (excluding timestamp), or None if no file
+        """
+        version = self._client_version(client_id)
+        if version is None:
+            return None
+
+        base_version, parts = version
+        paths = [self._file_path(client_id)] if base_version is not None else []
+        part_dir = self._part_dir(client_id)
+        paths.extend(os.path.join(part_dir, name) for name in parts)
+
+        columns: Dict[str, None] = {}  # insertion-ordered set
+        try:
+            for path in paths:
+                for field in pq.read_schema(path):
+                    if field.name != "timestamp" and (
+                        pa.types.is_integer(field.type) or pa.types.is_floating(field.type)
+                    ):
+                        columns.setdefault(field.name, None)
+        except FileNotFoundError:
+            # Part merged away meanwhile; its columns are in the main file now
+            return self.get_numeric_columns(client_id)
+        except Exception as e:
+            logger.error(f"Failed to inspect columns for {client_id}: {e}")
+            return None
+
+        return list(columns)
+
+    def close(self) -> None:
+        """Clear cache on shutdown."""
+        self._clients_cache = None
+        self._cached_read_client.cache_clear()
+        self._cached_row_group_max.cache_clear()
+        logger.info("Parquet storage closed and cache cleared")
+
+    # Helper methods
+
+    def _file_path(self, client_id: str) -> str:
+        """Return the main Parquet file path for a client."""
+        return os.path.join(self.data_dir, f"{client_id}.parquet")
+
+    def _part_dir(self, client_id: str) -> str:
+        """Return the directory holding a client's not yet compacted part files."""
+        return os.path.join(self.data_dir, f"{client_id}.parts")
+
+    def _get_file_version(self, file_path: str) -> Optional[Tuple[int, int]]:
+        """
+        Get (mtime_ns, size) of a file for cache keys.
+
+        Args:
+            file_path: Path to the Parquet file
+
+        Returns:
+            Tuple of (st_mtime_ns, st_size), or None if the file doesn't exist
+        """
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    @staticmethod
+    def _list_parts(part_dir: str) -> Tuple[str, ...]:
+        """
+        List a client's part files, oldest first.
+
+        Args:
+            part_dir: The client's parts directory
+
+        Returns:
+            Sorted tuple of part file names (empty if the directory doesn't exist)
+        """
+        try:
+            with os.scandir(part_dir) as entries:
+                return tuple(sorted(
+                    e.name for e in entries
+                    if e.name.endswith(".parquet") and not e.name.startswith(".")
+                ))
+        except FileNotFoundError:
+            return ()
+
+    def _client_version(self, client_id: str) -> Optional[Tuple[Any, Tuple[str, ...]]]:
+        """
+        Return (main file version, part names) for a client, or None if it has no data.
+
+        Part files are never modified once written, so their names are enough.
+        """
+        base_version = self._get_file_version(self._file_path(client_id))
+        parts = self._list_parts(self._part_dir(client_id))
+        if base_version is None and not parts:
+            return None
+        return (base_version, parts)
+
+    def _merged_parts(self, schema) -> frozenset:
+        """Return the part names a main file's schema metadata says it has absorbed."""
+        value = (schema.metadata or {}).get(self.MERGED_PARTS_KEY)
+        return frozenset(json.loads(value)) if value else frozenset()
+
+    def _append_rows(self, client_id: str, new_rows: pd.DataFrame) -> None:
+        """
+        Write new rows for a client without rewriting its existing data.
+
+        A client's first rows become its main file; after that each call adds
+        one part file, and the parts are compacted once COMPACT_PARTS exist.
+        Compaction is best-effort: once the part is written the rows are
+        stored, so a failed compaction is logged and retried on a later write
+        rather than reported (which would make the caller write them again).
+
+        Args:
+            client_id: Unique identifier for the client
+            new_rows: Rows to add (timestamps as ISO 8601 strings or datetimes)
+        """
+        if "timestamp" in new_rows.columns:
+            new_rows["timestamp"] = pd.to_datetime(new_rows["timestamp"], format="ISO8601")
+
+        file_path = self._file_path(client_id)
+        if not os.path.exists(file_path):
+            with file_lock(file_path):
+                if not os.path.exists(file_path):
+                    self._write_main_file(file_path, new_rows, merged=())
+                    # New client file: don't wait for the directory mtime to change
+                    self._clients_cache = None
+                    return
+
+        part_dir = self._part_dir(client_id)
+        os.makedirs(part_dir, exist_ok=True)
+
+        # Sortable, unique across processes; written under a hidden name, then renamed in
+        name = f"{time.time_ns():020d}-{os.getpid()}-{next(self._part_seq)}.parquet"
+        tmp_path = os.path.join(part_dir, f".{name}.tmp")
+        pq.write_table(self._to_table(new_rows), tmp_path)
+        os.replace(tmp_path, os.path.join(part_dir, name))
+
+        if len(self._list_parts(part_dir)) >= self.COMPACT_PARTS:
+            try:
+                self._compact(client_id)
+            except Exception as e:
+                logger.error(f"Failed to compact part files for client {client_id}: {e}")
+
+    def _compact(self, client_id: str) -> None:
+        """
+        Merge a client's part files into its main file, then delete them.
+
+        The new main file lists the parts it absorbed, so a crash before
+        they are deleted leaves them ignored by readers and removed by the
+        next compaction, instead of counted twice.
+
+        Args:
+            client_id: Unique identifier for the client
+        """
+        file_path = self._file_path(client_id)
+        part_dir = self._part_dir(client_id)
+
+        with file_lock(file_path):
+            frames = []
+            merged_before = frozenset()
+            if os.path.exists(file_path):
+                pf = pq.ParquetFile(file_path)
+                merged_before = self._merged_parts(pf.schema_arrow)
+                frames.append(pf.read().to_pandas())
+
+            # Leftovers of an interrupted compaction are already in the main file
+            self._remove_parts(part_dir, merged_before)
+
+            # Another process may have compacted while this one waited for the lock
+            parts = [p for p in self._list_parts(part_dir) if p not in merged_before]
+            if len(parts) < self.COMPACT_PARTS:
+                return
+
+            frames.extend(pd.read_parquet(os.path.join(part_dir, p)) for p in parts)
+            df = pd.concat(frames, ignore_index=True)
+            if "timestamp" in df.columns and not df["timestamp"].is_monotonic_increasing:
+                df = df.sort_values("timestamp", kind="stable", ignore_index=True)
+
+            self._write_main_file(file_path, df, merged=parts)
+            self._remove_parts(part_dir, parts)
+
+        logger.debug(f"Compacted {len(parts)} part files for client {client_id}")
+
+    def _write_main_file(self, file_path: str, df: pd.DataFrame, merged: Iterable[str]) -> None:
+        """
+        Atomically replace a client's main file.
+
+        Args:
+            file_path: Path to the main Parquet file
+            df: All of the client's rows
+            merged: Part file names whose rows df includes
+        """
+        if "timestamp" in df.columns and not df["timestamp"].is_monotonic_increasing:
+            df = df.sort_values("timestamp", kind="stable", ignore_index=True)
+
+        table = self._to_table(df)
+        metadata = dict(table.schema.metadata or {})
+        metadata[self.MERGED_PARTS_KEY] = json.dumps(list(merged)).encode()
+
+        tmp_path = f"{file_path}.tmp"
+        pq.write_table(
+            table.replace_schema_metadata(metadata), tmp_path,
+            row_group_size=self.ROW_GROUP_SIZE
+        )
+        os.replace(tmp_path, file_path)
+
+    @staticmethod
+    def _to_table(df: pd.DataFrame) -> "pa.Table":
+        """
+        Convert rows to an Arrow table, tolerating columns of mixed types.
+
+        A field can change type between readings (e.g. a sensor reporting
+        "err" instead of a number), which leaves an object column Arrow
+        can't convert; such columns are stored as strings instead.
+
+        Args:
+            df: Rows to convert
+
+        Returns:
+            Arrow table without the pandas index
+        """
+        try:
+            return pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            df = df.copy()
+            for column in df.columns:
+                if df[column].dtype == object:
+                    df[column] = df[column].where(df[column].isna(), df[column].astype(str))
+            return pa.Table.from_pandas(df, preserve_index=False)
+
+    @staticmethod
+    def _remove_parts(part_dir: str, names: Iterable[str]) -> None:
+        """Delete part files, ignoring ones already gone."""
+        for name in names:
+            try:
+                os.remove(os.path.join(part_dir, name))
+            except FileNotFoundError:
+                pass
+
+    def _first_row_group(
+        self,
+        file_path: str,
+        version: Tuple[int, int],
+        cutoff_date
+    ) -> int:
+        """
+        Return the index of the first row group that may hold rows at or after cutoff_date.
+
+        Rows are sorted by timestamp, so each group's max timestamp is
+        increasing and the answer is a binary search over the footer statistics.
+
+        Args:
+            file_path: Path to the Parquet file
+            version: File version for cache invalidation
+            cutoff_date: Earliest timestamp wanted, or None for all rows
+
+        Returns:
+            Row group index (0 when nothing can be skipped)
+        """
+        if cutoff_date is None:
+            return 0
+        group_max = self._cached_row_group_max(file_path, version)
+        if not group_max:
+            return 0
+        # Keep at least the last group, so an empty range still yields the columns
+        return min(bisect_left(group_max, pd.Timestamp(cutoff_date)), len(group_max) - 1)
+
+    @lru_cache(maxsize=32)
+    def _cached_row_group_max(
+        self,
+        file_path: str,
+        version: Tuple[int, int]
+    ) -> Tuple[pd.Timestamp, ...]:
+        """
+        Cached per-row-group max timestamps from the file footer.
+
+        Args:
+            file_path: Path to the Parquet file
+            version: File version for cache invalidation
+
+        Returns:
+            Tuple of max timestamps, one per row group; empty if the file has
+            no timestamp column or statistics
+        """
+        metadata = pq.read_metadata(file_path)
+        index = metadata.schema.to_arrow_schema().get_field_index("timestamp")
+        if index < 0:
+            return ()
+
+        group_max = []
+        for i in range(metadata.num_row_groups):
+            stats = metadata.row_group(i).column(index).statistics
+            if stats is None or not stats.has_min_max:
+                return ()
+            group_max.append(pd.Timestamp(stats.max))
+        return tuple(group_max)
+
+    @lru_cache(maxsize=32)
+    def _cached_read_client(
+        self,
+        client_id: str,
+        version: Tuple[Any, Tuple[str, ...]],
+        usecols: Optional[Tuple[str, ...]] = None,
+        first_group: int = 0
+    ) -> Optional[pd.DataFrame]:
+        """
+        Cached read of a client's main file and part files, sorted by timestamp.
+
+        Cache key includes the data version (main file stat and part names)
+        to invalidate on every write. Files are memory-mapped, so hot files
+        are served from the page cache.
+
+        Args:
+            client_id: Unique identifier for the client
+            version: Data version from _client_version()
+            usecols: Column names to read (None for all); missing names are skipped
+            first_group: Index of the first main-file row group to read
+
+        Returns:
+            DataFrame with the client's rows, or None if it has no data
+
+        Raises:
+            FileNotFoundError: If a listed part was compacted away meanwhile
+        """
+        base_version, parts = version
+        frames = []
+        merged = frozenset()
+        if base_version is not None:
+            pf = pq.ParquetFile(self._file_path(client_id), memory_map=True)
+            # Taken from the file actually read, so absorbed parts are never read twice
+            merged = self._merged_parts(pf.schema_arrow)
+            frames.append(self._read_file(pf, usecols, first_group))
+
+        part_dir = self._part_dir(client_id)
+        for name in parts:
+            if name not in merged:
+                pf = pq.ParquetFile(os.path.join(part_dir, name), memory_map=True)
+                frames.append(self._read_file(pf, usecols))
+
+        if not frames:
+            return None
+        df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+        # Parts hold whatever arrived in each flush, possibly out of order
+        if "timestamp" in df.columns and not df["timestamp"].is_monotonic_increasing:
+            df = df.sort_values("timestamp", kind="stable", ignore_index=True)
+        return df
+
+    @staticmethod
+    def _read_file(
+        pf,
+        usecols: Optional[Tuple[str, ...]] = None,
+        first_group: int = 0
+    ) -> pd.DataFrame:
+        """
+        Read an opened Parquet file into a DataFrame.
+
+        Args:
+            pf: pyarrow ParquetFile
+            usecols: Column names to read (None for all); missing names are skipped
+            first_group: Index of the first row group to read
+
+        Returns:
+            DataFrame with the selected row groups and columns
+        """
+        columns = None
+        if usecols is not None:
+            available = set(pf.schema_arrow.names)
+            columns = [c for c in usecols if c in available]
+
+        if first_group == 0:
+            table = pf.read(columns=columns)
+        else:
+            table = pf.read_row_groups(range(first_group, pf.num_row_groups), columns=columns)
+        return table.to_pandas()
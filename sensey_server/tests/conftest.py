@@ -6,41 +6,38 @@ This module provides common fixtures and configuration for all tests.
 
 import pytest
 import os
-import tempfile
-import shutil
-from datetime import datetime, timedelta
+from datetime import datetime
+import numpy as np
 import pandas as pd
 
+# Reference time for the session-scoped sample data below
+_NOW = datetime.now()
+
 
 @pytest.fixture
-def temp_dir():
-    """Create a temporary directory for test data."""
-    temp_path = tempfile.mkdtemp()
-    yield temp_path
-    shutil.rmtree(temp_path)
+def temp_dir(tmp_path):
+    """Temporary directory for test data, as a str path (pytest cleans up old runs)."""
+    return str(tmp_path)
 
 
 @pytest.fixture
-def test_config_csv(temp_dir):
+def test_config_csv(tmp_path):
     """Create a test configuration file for CSV storage."""
-    config_path = os.path.join(temp_dir, "test_sensey.ini")
-    config_content = f"""[storage]
+    config_path = tmp_path / "test_sensey.ini"
+    config_path.write_text(f"""[storage]
 backend = csv
 
 [csv]
-data_dir = {temp_dir}/data
-"""
-    with open(config_path, 'w') as f:
-        f.write(config_content)
-    return config_path
+data_dir = {tmp_path}/data
+""")
+    return str(config_path)
 
 
 @pytest.fixture
-def test_config_mysql():
+def test_config_mysql(tmp_path_factory):
     """Create a test configuration file for MySQL storage."""
-    temp_path = tempfile.mkdtemp()
-    config_path = os.path.join(temp_path, "test_sensey.ini")
-    config_content = """[storage]
+    config_path = tmp_path_factory.mktemp("mysql_cfg") / "test_sensey.ini"
+    config_path.write_text("""[storage]
 backend = mysql
 
 [mysql]
@@ -50,20 +47,15 @@ user = test_sensey
 password = test_password
 database = test_sensey
 pool_size = 2
-"""
-    with open(config_path, 'w') as f:
-        f.write(config_content)
+""")
+    return str(config_path)
 
-    yield config_path
 
-    shutil.rmtree(temp_path)
-
-
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_sensor_data():
-    """Generate sample sensor data for testing."""
+    """Sample sensor data for testing (shared by all tests - don't mutate it)."""
     return {
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': _NOW.isoformat(),
         'temperature': 23.5,
         'humidity': 65.2,
         'lux': 150.0,
@@ -71,80 +63,119 @@ def sample_sensor_data():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_sensor_data_batch():
-    """Generate a batch of sample sensor data for testing."""
-    base_time = datetime.now()
-    data = []
-
-    for i in range(10):
-        timestamp = base_time - timedelta(minutes=i * 5)
-        data.append({
-            'timestamp': timestamp.isoformat(),
-            'temperature': 20.0 + i * 0.5,
-            'humidity': 60.0 + i * 1.0,
-            'lux': 100.0 + i * 10.0,
-            'soil_moisture': 30.0 + i * 0.5
-        })
-
-    return data
+    """Batch of sample sensor data for testing, as a tuple so tests can't reorder or extend it."""
+    i = np.arange(10)
+    batch = pd.DataFrame({
+        # Newest first, 5 minutes apart
+        'timestamp': pd.date_range(end=_NOW, periods=10, freq='5min')[::-1].strftime('%Y-%m-%dT%H:%M:%S.%f'),
+        'temperature': 20.0 + i * 0.5,
+        'humidity': 60.0 + i * 1.0,
+        'lux': 100.0 + i * 10.0,
+        'soil_moisture': 30.0 + i * 0.5
+    })
+    return tuple(batch.to_dict('records'))
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_dataframe():
-    """Generate a sample pandas DataFrame for testing."""
-    base_time = datetime.now()
-    timestamps = [base_time - timedelta(hours=i) for i in range(24)]
+    """Sample pandas DataFrame for testing (shared by all tests - copy before modifying)."""
+    i = np.arange(24)
 
     return pd.DataFrame({
-        'timestamp': timestamps,
-        'temperature': [20.0 + i * 0.5 for i in range(24)],
-        'humidity': [60.0 + i * 1.0 for i in range(24)],
-        'lux': [100.0 + i * 5.0 for i in range(24)]
+        'timestamp': pd.date_range(end=_NOW, periods=24, freq='h')[::-1],
+        'temperature': 20.0 + i * 0.5,
+        'humidity': 60.0 + i * 1.0,
+        'lux': 100.0 + i * 5.0
     })
 
 
+@pytest.fixture(scope="class")
+def _class_csv_storage(tmp_path_factory):
+    """One initialized CSV storage backend shared by a test class."""
+    from storage import CSVStorage
+
+    storage = CSVStorage(data_dir=tmp_path_factory.mktemp("csv"))
+
+    yield storage
+
+    storage.close()
+
+
+@pytest.fixture
+def csv_storage(_class_csv_storage):
+    """Empty CSV storage backend, reused within a test class and reset per test."""
+    storage = _class_csv_storage
+    for entry in os.scandir(storage.data_dir):
+        os.remove(entry.path)
+    # Drop cached frames and listings; a new file may reuse an old inode
+    storage.close()
+
+    return storage
+
+
+@pytest.fixture
+def one_row_storage(temp_dir, sample_sensor_data):
+    """Create a CSV storage backend holding a single reading for test_client."""
+    from storage import CSVStorage
+
+    storage = CSVStorage(data_dir=temp_dir)
+    storage.store_data("test_client", sample_sensor_data)
+
+    yield storage
+
+    storage.close()
+
+
 @pytest.fixture
 def csv_storage_with_data(temp_dir, sample_sensor_data_batch):
     """Create a CSV storage backend with test data."""
     from storage import CSVStorage
 
     storage = CSVStorage(data_dir=temp_dir)
-    storage.initialize()
 
-    # Store test data
-    for data in sample_sensor_data_batch:
-        storage.store_data("test_client", data)
+    # Store test data with one bulk append
+    storage.store_batch(("test_client", data) for data in sample_sensor_data_batch)
 
     yield storage
 
     storage.close()
 
 
-@pytest.fixture
-def flask_test_client(test_config_csv, monkeypatch):
-    """Create a Flask test client with test configuration."""
-    # Set the config path environment variable
-    monkeypatch.setenv('SENSEY_CONFIG_PATH', test_config_csv)
+@pytest.fixture(scope="session")
+def _flask_app(tmp_path_factory):
+    """
+    Import the app module once per session.
 
-    # Import app after setting env var
-    # This ensures the app uses our test config
-    import sys
-    import importlib
+    Importing app builds the default application, which needs a valid config,
+    so SENSEY_CONFIG_PATH points at a throwaway CSV config while it happens.
+    Tests then build their own application with app.create_app().
+    """
+    base = tmp_path_factory.mktemp("app")
+    config_path = base / "test_sensey.ini"
+    config_path.write_text(f"[storage]\nbackend = csv\n\n[csv]\ndata_dir = {base}/data\n")
 
-    # Remove cached modules to force reload with test config
-    modules_to_remove = [m for m in sys.modules.keys()
-                         if m.startswith('storage') or m == 'config' or m == 'sensey_data' or m == 'app']
-    for module in modules_to_remove:
-        del sys.modules[module]
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv('SENSEY_CONFIG_PATH', str(config_path))
+        import app as flask_app
 
-    # Now import app which will use test config
-    import app as flask_app
+    yield flask_app
 
-    flask_app.app.config['TESTING'] = True
-    client = flask_app.app.test_client()
+    import sensey_data
+    sensey_data.close_storage()
 
-    yield client
+
+@pytest.fixture
+def flask_test_client(_flask_app, test_config_csv, monkeypatch):
+    """Create a Flask test client for an app built from test_config_csv."""
+    # Storage auto-initialization (after close_storage()) reads the same file
+    monkeypatch.setenv('SENSEY_CONFIG_PATH', test_config_csv)
+
+    app = _flask_app.create_app(test_config_csv)
+    app.config['TESTING'] = True
+
+    yield app.test_client()
 
     # Cleanup storage
     import sensey_data
@@ -158,11 +189,11 @@ def mock_mysql_available(monkeypatch):
     monkeypatch.setattr(mysql_module, 'MYSQL_AVAILABLE', True)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_nested_sensor_data():
-    """Generate sample sensor data with nested readings."""
+    """Sample sensor data with nested readings (shared by all tests - don't mutate it)."""
     return {
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': _NOW.isoformat(),
         'readings': {
             'temperature': 23.5,
             'humidity': 65.2,
@@ -6,6 +6,7 @@ Tests the Flask app endpoints and integration with storage backend.
 
 import pytest
 import json
+import os
 from datetime import datetime
 
 
@@ -16,8 +17,7 @@ class TestDataReceival:
         """Test receiving sensor data successfully."""
         response = flask_test_client.post(
             '/data/test_client',
-            data=json.dumps(sample_sensor_data),
-            content_type='application/json'
+            json=sample_sensor_data
         )
 
         assert response.status_code == 200
@@ -34,13 +34,37 @@ class TestDataReceival:
 
         assert response.status_code == 400
 
+    @pytest.mark.parametrize("body", [[1, 2, 3], "hello", 42])
+    def test_receive_data_rejects_non_object_json(self, flask_test_client, sample_sensor_data, body):
+        """Test that JSON which isn't an object is rejected instead of queued."""
+        import sensey_data
+
+        response = flask_test_client.post('/data/bad', json=body)
+        assert response.status_code == 400
+        assert len(sensey_data._pending) == 0
+
+        # Later readings are still written
+        flask_test_client.post('/data/good', json=sample_sensor_data)
+        assert len(sensey_data.get_latest_data('good', 'all')) == 1
+
+    def test_receive_data_invalid_client_id(self, flask_test_client, sample_sensor_data):
+        """Test that malformed client IDs are rejected before storage."""
+        for client_id in ['..', '.hidden', 'a' * 65, 'bad%20id']:
+            response = flask_test_client.post(
+                f'/data/{client_id}',
+                json=sample_sensor_data
+            )
+            assert response.status_code == 400
+
+        response = flask_test_client.get('/charts/..')
+        assert response.status_code == 400
+
     def test_receive_data_stores_in_backend(self, flask_test_client, sample_sensor_data):
         """Test that received data is stored in backend."""
         # Send data
         flask_test_client.post(
             '/data/test_client',
-            data=json.dumps(sample_sensor_data),
-            content_type='application/json'
+            json=sample_sensor_data
         )
 
         # Verify it's stored
@@ -48,6 +72,120 @@ class TestDataReceival:
         clients = sensey_data.get_available_clients()
         assert 'test_client' in clients
 
+    def test_receive_data_is_batched(self, flask_test_client, sample_sensor_data_batch):
+        """Test that POSTs are queued and written together on flush."""
+        import sensey_data
+        sensey_data.stop_background_flush()
+
+        for data in sample_sensor_data_batch:
+            response = flask_test_client.post(
+                '/data/test_client',
+                json=data
+            )
+            assert response.status_code == 200
+
+        assert len(sensey_data._pending) == len(sample_sensor_data_batch)
+        assert sensey_data.flush_pending() == len(sample_sensor_data_batch)
+        assert len(sensey_data._pending) == 0
+
+        df = sensey_data.get_latest_data('test_client', 'all')
+        assert len(df) == len(sample_sensor_data_batch)
+
+    def test_full_batch_wakes_flusher(self, flask_test_client, sample_sensor_data, monkeypatch):
+        """Test that a full batch is written without waiting for the flush interval."""
+        import time
+        import sensey_data
+        sensey_data.stop_background_flush()
+        monkeypatch.setattr(sensey_data, 'MAX_BATCH', 2)
+        sensey_data.start_background_flush(interval=60)
+
+        for _ in range(2):
+            flask_test_client.post(
+                '/data/test_client',
+                json=sample_sensor_data
+            )
+
+        deadline = time.monotonic() + 5
+        while sensey_data._pending and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert len(sensey_data._pending) == 0
+
+    def test_receive_data_buffer_full(self, flask_test_client, sample_sensor_data, monkeypatch):
+        """Test that a full write buffer is reported so the client retries."""
+        import sensey_data
+        sensey_data.stop_background_flush()
+        monkeypatch.setattr(sensey_data, 'MAX_PENDING', 0)
+
+        response = flask_test_client.post(
+            '/data/test_client',
+            json=sample_sensor_data
+        )
+
+        assert response.status_code == 500
+
+    def test_receive_data_rejects_bad_timestamp(self, flask_test_client):
+        """Test that a reading no backend could store is rejected instead of queued."""
+        import sensey_data
+
+        for timestamp in ['not a time', 1734517800]:
+            response = flask_test_client.post('/data/test_client', json={'timestamp': timestamp, 'temperature': 1.0})
+            assert response.status_code == 400
+        assert len(sensey_data._pending) == 0
+
+
+class TestWriteBuffer:
+    """Test how the write-behind queue handles readings that fail to store."""
+
+    @staticmethod
+    def _fail_client(monkeypatch, client_id):
+        """Make the CSV backend fail every write for one client."""
+        import sensey_data
+        storage = sensey_data._get_storage()
+        original = storage._append_rows
+
+        def append_rows(file_path, rows):
+            if os.path.basename(file_path) == f"{client_id}.csv":
+                raise OSError("disk error")
+            return original(file_path, rows)
+
+        monkeypatch.setattr(storage, '_append_rows', append_rows)
+
+    def test_flush_requeues_only_failed_clients(self, flask_test_client, sample_sensor_data, monkeypatch):
+        """Test that a failing client is retried without blocking or duplicating the others."""
+        import sensey_data
+        from storage import BatchStoreError
+        sensey_data.stop_background_flush()
+        self._fail_client(monkeypatch, 'bad')
+
+        sensey_data.queue_data('bad', sample_sensor_data)
+        sensey_data.queue_data('good', sample_sensor_data)
+
+        for _ in range(2):
+            with pytest.raises(BatchStoreError) as exc_info:
+                sensey_data.flush_pending()
+            assert exc_info.value.failed_clients == {'bad'}
+            assert [c for c, _ in sensey_data._pending] == ['bad']
+
+        assert len(sensey_data.get_latest_data('good', 'all')) == 1  # Written once, not per retry
+
+    def test_flush_drops_client_after_retry_limit(self, flask_test_client, sample_sensor_data, monkeypatch):
+        """Test that readings which keep failing are dropped instead of retried forever."""
+        import sensey_data
+        from storage import StorageError
+        sensey_data.stop_background_flush()
+        monkeypatch.setattr(sensey_data, 'MAX_FLUSH_RETRIES', 2)
+        self._fail_client(monkeypatch, 'bad')
+
+        sensey_data.queue_data('bad', sample_sensor_data)
+        for _ in range(3):
+            with pytest.raises(StorageError):
+                sensey_data.flush_pending()
+
+        assert len(sensey_data._pending) == 0
+        sensey_data.queue_data('good', sample_sensor_data)
+        assert sensey_data.flush_pending() == 1
+
 
 class TestIndexPage:
     """Test the index page endpoint."""
@@ -64,8 +202,7 @@ class TestIndexPage:
         # Add some data first
         flask_test_client.post(
             '/data/test_client',
-            data=json.dumps(sample_sensor_data),
-            content_type='application/json'
+            json=sample_sensor_data
         )
 
         response = flask_test_client.get('/')
@@ -73,6 +210,48 @@ class TestIndexPage:
         assert response.status_code == 200
         assert b'test_client' in response.data
 
+    def test_index_html_rerendered_for_new_client(self, flask_test_client, sample_sensor_data, monkeypatch):
+        """Test that the cached dashboard page is rebuilt when the client list changes."""
+        import app as flask_app
+
+        flask_test_client.post('/data/client1', json=sample_sensor_data)
+        first = flask_test_client.get('/').data
+        assert flask_test_client.get('/').data == first
+
+        flask_test_client.post('/data/client2', json=sample_sensor_data)
+        monkeypatch.setattr(flask_app, '_clients_cache', (0.0, None))  # Expire client list
+
+        assert b'client2' in flask_test_client.get('/').data
+
+    def test_client_list_cached_between_requests(self, flask_test_client, sample_sensor_data, monkeypatch):
+        """Test that / and /health share one client scan within the TTL."""
+        import app as flask_app
+        import sensey_data
+
+        flask_test_client.post(
+            '/data/test_client',
+            json=sample_sensor_data
+        )
+
+        calls = []
+        original = sensey_data.get_available_clients
+
+        def counting_clients():
+            calls.append(1)
+            return original()
+
+        monkeypatch.setattr(sensey_data, 'get_available_clients', counting_clients)
+
+        assert flask_test_client.get('/').status_code == 200
+        assert flask_test_client.get('/health').status_code == 200
+        assert flask_test_client.get('/').status_code == 200
+        assert len(calls) == 1
+
+        # Expired entries are refreshed on the next request
+        monkeypatch.setattr(flask_app, '_clients_cache', (0.0, ['stale']))
+        flask_test_client.get('/health')
+        assert len(calls) == 2
+
 
 class TestChartsPage:
     """Test the charts page endpoint."""
@@ -90,8 +269,7 @@ class TestChartsPage:
         for data in sample_sensor_data_batch:
             flask_test_client.post(
                 '/data/test_client',
-                data=json.dumps(data),
-                content_type='application/json'
+                json=data
             )
 
         response = flask_test_client.get('/charts/test_client')
@@ -99,53 +277,269 @@ class TestChartsPage:
         assert response.status_code == 200
         assert b'test_client' in response.data
 
-    def test_charts_time_range_selection(self, flask_test_client, sample_sensor_data_batch):
+    def test_charts_downsample_dense_data(self, flask_test_client):
+        """Test that dense data is downsampled to MAX_CHART_POINTS, keeping peaks."""
+        import app as flask_app
+        import sensey_data
+        from datetime import timedelta
+
+        start = datetime.now() - timedelta(hours=2)
+        sensey_data.store_batch(
+            ('dense_client', {'timestamp': (start + timedelta(seconds=i)).isoformat(),
+                              'temperature': 99.0 if i == 1234 else 20.0 + (i % 10)})
+            for i in range(2 * flask_app.MAX_CHART_POINTS + 1)
+        )
+
+        charts = list(flask_app._generate_charts('dense_client', 'all'))
+        figure = json.loads(charts[0]['json'])
+
+        assert len(figure['data'][0]['x']) <= flask_app.MAX_CHART_POINTS
+        assert max(figure['data'][0]['y']) == 99.0
+
+    def test_charts_no_numeric_columns(self, flask_test_client):
+        """Test charts page for a client whose readings are all non-numeric."""
+        import sensey_data
+        sensey_data.store_data('text_client', {'timestamp': datetime.now().isoformat(), 'status': 'ok'})
+
+        response = flask_test_client.get('/charts/text_client')
+
+        assert response.status_code == 200
+        assert b'No data available' in response.data
+
+    @pytest.mark.parametrize("time_range", ['1h', '6h', '1d', '3d', '7d', 'all'])
+    def test_charts_time_range_selection(self, flask_test_client, sample_sensor_data_batch, time_range):
         """Test charts with different time ranges."""
-        # Add data
+        import sensey_data
+        sensey_data.store_batch(('test_client', data) for data in sample_sensor_data_batch)
+
+        response = flask_test_client.get(f'/charts/test_client?range={time_range}')
+        assert response.status_code == 200
+        assert b'test_client' in response.data  # Reads the streamed body to the end
+
+    def test_charts_load_shared_plotly_js(self, flask_test_client, sample_sensor_data_batch):
+        """Test that charts reference one shared plotly.js instead of inlining it."""
         for data in sample_sensor_data_batch:
             flask_test_client.post(
                 '/data/test_client',
-                data=json.dumps(data),
-                content_type='application/json'
+                json=data
             )
 
-        # Test different time ranges
-        for time_range in ['1h', '6h', '1d', '3d', '7d', 'all']:
-            response = flask_test_client.get(f'/charts/test_client?range={time_range}')
-            assert response.status_code == 200
+        response = flask_test_client.get('/charts/test_client')
+        assert response.data.count(b'/plotly.min.js') == 1
+        assert b'Plotly.newPlot("chart-temperature"' in response.data
+
+        js_response = flask_test_client.get('/plotly.min.js')
+        assert js_response.status_code == 200
+        assert js_response.mimetype == 'application/javascript'
+
+    def test_charts_page_streamed(self, flask_test_client, sample_sensor_data_batch):
+        """Test that the charts page is streamed with each chart's script next to its div."""
+        flask_test_client.post(
+            '/data/test_client',
+            json=sample_sensor_data_batch[0]
+        )
+
+        response = flask_test_client.get('/charts/test_client')
+        assert response.is_streamed
+
+        html = response.get_data(as_text=True)
+        div = html.index('<div id="chart-temperature">')
+        assert html.index('Plotly.newPlot("chart-temperature"') < html.index('<div id="chart-humidity">')
+        assert div < html.index('Plotly.newPlot("chart-temperature"')
+
+    def test_charts_cached_until_new_data(self, flask_test_client, sample_sensor_data_batch, monkeypatch):
+        """Test that charts are reused until the client's data changes."""
+        import sensey_data
+
+        flask_test_client.post(
+            '/data/test_client',
+            json=sample_sensor_data_batch[0]
+        )
+
+        reads = []
+        original_get_latest_data = sensey_data.get_latest_data
+
+        def counting_get_latest_data(*args, **kwargs):
+            reads.append(args)
+            return original_get_latest_data(*args, **kwargs)
+
+        monkeypatch.setattr(sensey_data, 'get_latest_data', counting_get_latest_data)
+
+        flask_test_client.get('/charts/test_client').get_data()
+        flask_test_client.get('/charts/test_client').get_data()
+        assert len(reads) == 1  # Second request served from cache
+
+        # New data changes the version and invalidates the cached charts
+        flask_test_client.post(
+            '/data/test_client',
+            json=sample_sensor_data_batch[1]
+        )
+        flask_test_client.get('/charts/test_client').get_data()
+        assert len(reads) == 2
+
+    def test_charts_cached_for_ttl_without_version(self, flask_test_client, sample_sensor_data_batch, monkeypatch):
+        """Test that backends without a version token are cached per TTL window."""
+        import sensey_data
+        import app as flask_app
+
+        flask_test_client.post(
+            '/data/test_client',
+            json=sample_sensor_data_batch[0]
+        )
+
+        reads = []
+        original_get_latest_data = sensey_data.get_latest_data
+
+        def counting_get_latest_data(*args, **kwargs):
+            reads.append(args)
+            return original_get_latest_data(*args, **kwargs)
+
+        monkeypatch.setattr(sensey_data, 'get_latest_data', counting_get_latest_data)
+        monkeypatch.setattr(sensey_data, 'get_data_version', lambda client_id: None)
+
+        clock = [1000.0]
+        monkeypatch.setattr(flask_app.time, 'monotonic', lambda: clock[0])
+
+        flask_test_client.get('/charts/test_client').get_data()
+        flask_test_client.get('/charts/test_client').get_data()
+        assert len(reads) == 1  # Same TTL window
+
+        clock[0] += flask_app.CHARTS_CACHE_TTL
+        response = flask_test_client.get('/charts/test_client')
+        assert response.status_code == 200
+        response.get_data()
+        assert len(reads) == 2  # Next window rebuilds
 
 
 class TestMultipleClients:
     """Test handling multiple clients."""
 
-    def test_multiple_clients_data_isolation(self, flask_test_client):
+    @pytest.mark.parametrize("client_id, temperature", [('client1', 20.0), ('client2', 25.0)])
+    def test_multiple_clients_data_isolation(self, flask_test_client, client_id, temperature):
         """Test that data from different clients is isolated."""
-        data1 = {
-            'timestamp': datetime.now().isoformat(),
-            'temperature': 20.0,
-            'humidity': 60.0
-        }
-        data2 = {
-            'timestamp': datetime.now().isoformat(),
-            'temperature': 25.0,
-            'humidity': 70.0
-        }
-
         # Store data for two clients
-        flask_test_client.post('/data/client1', data=json.dumps(data1), content_type='application/json')
-        flask_test_client.post('/data/client2', data=json.dumps(data2), content_type='application/json')
+        now = datetime.now().isoformat()
+        flask_test_client.post('/data/client1', json={'timestamp': now, 'temperature': 20.0, 'humidity': 60.0})
+        flask_test_client.post('/data/client2', json={'timestamp': now, 'temperature': 25.0, 'humidity': 70.0})
 
         # Verify both clients exist
         import sensey_data
-        clients = sensey_data.get_available_clients()
-        assert 'client1' in clients
-        assert 'client2' in clients
+        assert sensey_data.get_available_clients() == ['client1', 'client2']
 
         # Verify data isolation
-        df1 = sensey_data.get_latest_data('client1', 'all')
-        df2 = sensey_data.get_latest_data('client2', 'all')
+        df = sensey_data.get_latest_data(client_id, 'all')
+        assert len(df) == 1
+        assert df.iloc[0]['temperature'] == temperature
+
+
+class TestStorageInitialization:
+    """Test the compatibility layer's storage auto-initialization."""
+
+    def test_concurrent_auto_initialization_creates_one_backend(self, flask_test_client, monkeypatch):
+        """Test that racing first calls share a single auto-initialized backend."""
+        import threading
+        import time
+        import storage
+        import sensey_data
+
+        sensey_data.close_storage()
+
+        created = []
+        original = storage.create_storage_from_config
+
+        def slow_create(*args, **kwargs):
+            time.sleep(0.05)
+            instance = original(*args, **kwargs)
+            created.append(instance)
+            return instance
+
+        monkeypatch.setattr(storage, 'create_storage_from_config', slow_create)
+
+        barrier = threading.Barrier(8)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(sensey_data._get_storage())
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(created) == 1
+        assert all(r is created[0] for r in results)
+
+
+class TestAppConfiguration:
+    """Test that the app reads integration settings from the storage config."""
+
+    def test_system_units_from_config_path(self, test_config_csv, request):
+        """Test that [server] settings come from SENSEY_CONFIG_PATH, not ./sensey.ini."""
+        with open(test_config_csv, 'a') as f:
+            f.write("\n[server]\nsystem_units = imperial\n")
+
+        client = request.getfixturevalue('flask_test_client')
+
+        assert client.application.config['SYSTEM_UNITS'] == 'imperial'
+
+    def test_ecowitt_push(self, test_config_csv, request):
+        """Test the Ecowitt endpoint's replies when enabled in the config."""
+        with open(test_config_csv, 'a') as f:
+            f.write("\n[ecowitt]\nenabled = true\nurl = /ecowitt\nclient_name = weather\n")
+
+        client = request.getfixturevalue('flask_test_client')
+
+        for _ in range(2):
+            response = client.post('/ecowitt', data={'dateutc': '2025-12-18 10:30:00', 'tempf': '50.0'})
+            assert response.status_code == 200
+            assert response.data == b'success'
+
+        response = client.post('/ecowitt', data={})
+        assert response.status_code == 400
+        assert response.data == b'error: no data'
+
+        response = client.post('/ecowitt', data={'dateutc': 'not a time', 'tempf': '50.0'})
+        assert response.status_code == 400
+        assert response.data == b'error: invalid data'
+
+        import sensey_data
+        df = sensey_data.get_latest_data('weather', 'all')
+        assert len(df) == 2
+
+    def test_ecowitt_invalid_client_name(self, test_config_csv):
+        """Test that a client_name the charts page would reject fails at startup."""
+        import app as flask_app
+
+        with open(test_config_csv, 'a') as f:
+            f.write("\n[ecowitt]\nenabled = true\nclient_name = back yard\n")
+
+        with pytest.raises(ValueError, match="client_name"):
+            flask_app.create_app(test_config_csv)
+
+    def test_ecowitt_invalid_passkey_id(self, test_config_csv, request):
+        """Test that a PASSKEY-derived ID outside the client ID pattern isn't stored."""
+        with open(test_config_csv, 'a') as f:
+            f.write("\n[ecowitt]\nenabled = true\nurl = /ecowitt\n")
+
+        client = request.getfixturevalue('flask_test_client')
+        response = client.post('/ecowitt', data={'PASSKEY': 'bad key/..', 'tempf': '50.0'})
+
+        assert response.status_code == 400
+        import sensey_data
+        assert sensey_data.get_available_clients() == []
+
+    def test_ecowitt_push_rejected_when_buffer_full(self, test_config_csv, request, monkeypatch):
+        """Test that pushes go through the write buffer and fail while it is full."""
+        with open(test_config_csv, 'a') as f:
+            f.write("\n[ecowitt]\nenabled = true\nurl = /ecowitt\nclient_name = weather\n")
+
+        client = request.getfixturevalue('flask_test_client')
+
+        import sensey_data
+        monkeypatch.setattr(sensey_data, 'MAX_PENDING', 0)
 
-        assert len(df1) == 1
-        assert len(df2) == 1
-        assert df1.iloc[0]['temperature'] == 20.0
-        assert df2.iloc[0]['temperature'] == 25.0
+        response = client.post('/ecowitt', data={'dateutc': '2025-12-18 10:30:00', 'tempf': '50.0'})
+        assert response.status_code == 500
+        assert sensey_data.get_latest_data('weather', 'all') is None
@@ -9,8 +9,6 @@ Tests the config module functionality including:
 """
 
 import pytest
-import os
-import tempfile
 from config import SenseyConfig, ConfigurationError
 
 
@@ -45,68 +43,33 @@ class TestConfigValidation:
         config = SenseyConfig(config_path=test_config_csv)
         assert config.get_storage_backend() == 'csv'
 
-    def test_missing_storage_section(self, temp_dir):
-        """Test validation fails with missing [storage] section."""
-        config_path = os.path.join(temp_dir, "bad_config.ini")
-        with open(config_path, 'w') as f:
-            f.write("[csv]\ndata_dir = /tmp\n")
+    def test_invalid_config_file_rejected(self, tmp_path):
+        """Test that a config file on disk is validated like INI text."""
+        config_path = tmp_path / "bad_config.ini"
+        config_path.write_text("[csv]\ndata_dir = /tmp\n")
 
         with pytest.raises(ConfigurationError) as exc_info:
-            SenseyConfig(config_path=config_path)
+            SenseyConfig(config_path=str(config_path))
 
         assert "storage" in str(exc_info.value).lower()
 
-    def test_invalid_backend_type(self, temp_dir):
-        """Test validation fails with invalid backend type."""
-        config_path = os.path.join(temp_dir, "bad_config.ini")
-        with open(config_path, 'w') as f:
-            f.write("[storage]\nbackend = invalid_backend\n")
-
-        with pytest.raises(ConfigurationError) as exc_info:
-            SenseyConfig(config_path=config_path)
-
-        assert "invalid" in str(exc_info.value).lower()
-
-    def test_csv_missing_data_dir(self, temp_dir):
-        """Test validation fails when CSV backend missing data_dir."""
-        config_path = os.path.join(temp_dir, "bad_config.ini")
-        with open(config_path, 'w') as f:
-            f.write("[storage]\nbackend = csv\n[csv]\n")
-
-        with pytest.raises(ConfigurationError) as exc_info:
-            SenseyConfig(config_path=config_path)
-
-        assert "data_dir" in str(exc_info.value).lower()
-
-    def test_mysql_missing_required_params(self, temp_dir):
-        """Test validation fails when MySQL backend missing required params."""
-        config_path = os.path.join(temp_dir, "bad_config.ini")
-        with open(config_path, 'w') as f:
-            f.write("[storage]\nbackend = mysql\n[mysql]\nhost = localhost\n")
-
-        with pytest.raises(ConfigurationError) as exc_info:
-            SenseyConfig(config_path=config_path)
-
-        assert "mysql" in str(exc_info.value).lower()
-
-    def test_mysql_invalid_port(self, temp_dir):
-        """Test validation fails with invalid MySQL port."""
-        config_path = os.path.join(temp_dir, "bad_config.ini")
-        with open(config_path, 'w') as f:
-            f.write("""[storage]
-backend = mysql
-
-[mysql]
-host = localhost
-port = not_a_number
-user = test
-database = test
-""")
-
+    @pytest.mark.parametrize("ini, expected", [
+        pytest.param("[csv]\ndata_dir = /tmp\n", "storage", id="missing-storage-section"),
+        pytest.param("[storage]\nbackend = invalid_backend\n", "invalid", id="invalid-backend"),
+        pytest.param("[storage]\nbackend = csv\n[csv]\n", "data_dir", id="csv-missing-data-dir"),
+        pytest.param("[storage]\nbackend = parquet\n[parquet]\n", "data_dir", id="parquet-missing-data-dir"),
+        pytest.param("[storage]\nbackend = mysql\n[mysql]\nhost = localhost\n", "mysql",
+                     id="mysql-missing-params"),
+        pytest.param("[storage]\nbackend = mysql\n\n[mysql]\nhost = localhost\nport = not_a_number\n"
+                     "user = test\ndatabase = test\n", "port", id="mysql-invalid-port"),
+        pytest.param("backend = csv\n", "failed to read", id="not-ini"),
+    ])
+    def test_invalid_config_rejected(self, ini, expected):
+        """Test validation fails with a clear message for each kind of bad config."""
         with pytest.raises(ConfigurationError) as exc_info:
-            SenseyConfig(config_path=config_path)
+            SenseyConfig.from_string(ini)
 
-        assert "port" in str(exc_info.value).lower()
+        assert expected in str(exc_info.value).lower()
 
 
 class TestConfigAccess:
@@ -125,6 +88,13 @@ class TestConfigAccess:
         assert 'data_dir' in storage_config
         assert storage_config['data_dir'].endswith('/data')
 
+    def test_get_storage_config_parquet(self):
+        """Test getting Parquet storage configuration."""
+        config = SenseyConfig.from_string("[storage]\nbackend = parquet\n[parquet]\ndata_dir = /srv/sensey\n")
+
+        assert config.get_storage_backend() == 'parquet'
+        assert config.get_storage_config() == {'data_dir': "/srv/sensey"}
+
     def test_get_storage_config_mysql(self, test_config_mysql):
         """Test getting MySQL storage configuration."""
         config = SenseyConfig(config_path=test_config_mysql)
@@ -136,11 +106,9 @@ class TestConfigAccess:
         assert storage_config['database'] == 'test_sensey'
         assert storage_config['pool_size'] == 2
 
-    def test_get_storage_config_mysql_default_pool_size(self, temp_dir):
+    def test_get_storage_config_mysql_default_pool_size(self):
         """Test MySQL config uses default pool_size if not specified."""
-        config_path = os.path.join(temp_dir, "mysql_config.ini")
-        with open(config_path, 'w') as f:
-            f.write("""[storage]
+        config = SenseyConfig.from_string("""[storage]
 backend = mysql
 
 [mysql]
@@ -150,8 +118,6 @@ user = test
 password = pass
 database = test
 """)
-
-        config = SenseyConfig(config_path=config_path)
         storage_config = config.get_storage_config()
 
         # pool_size should not be in config if not specified in INI
@@ -173,18 +139,31 @@ class TestConfigGlobal:
 
         assert config1 is config2  # Same instance
 
-    def test_reload_config(self, test_config_csv, temp_dir):
+    def test_reload_config(self, test_config_csv, tmp_path):
         """Test that reload_config creates new instance."""
         from config import get_config, reload_config
 
         config1 = reload_config(test_config_csv)
 
         # Create different config
-        config_path2 = os.path.join(temp_dir, "config2.ini")
-        with open(config_path2, 'w') as f:
-            f.write("[storage]\nbackend = csv\n[csv]\ndata_dir = /other\n")
+        config_path2 = tmp_path / "config2.ini"
+        config_path2.write_text("[storage]\nbackend = csv\n[csv]\ndata_dir = /other\n")
 
-        config2 = reload_config(config_path2)
+        config2 = reload_config(str(config_path2))
 
         assert config1 is not config2  # Different instances
         assert config1.config_path != config2.config_path
+
+    def test_reload_config_reparses_changed_file(self, test_config_csv):
+        """Test that each reload gets its own parser and picks up an edited file."""
+        from config import reload_config
+
+        config1 = reload_config(test_config_csv)
+        assert reload_config(test_config_csv).config is not config1.config
+
+        with open(test_config_csv, 'a') as f:
+            f.write("\n[server]\nsystem_units = imperial\n")
+
+        config2 = reload_config(test_config_csv)
+        assert config2.config is not config1.config
+        assert config2.config.get('server', 'system_units') == 'imperial'
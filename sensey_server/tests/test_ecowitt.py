@@ -0,0 +1,65 @@
+"""
+Unit tests for the Ecowitt integration.
+
+Tests the Ecowitt form data parsing including:
+- Field mapping
+- Unit conversion (metric and imperial)
+- Rain sensor precedence
+"""
+
+import pytest
+from ecowitt import _parse_ecowitt_data
+
+
+@pytest.fixture
+def ecowitt_form():
+    """Sample Ecowitt Custom Server form data."""
+    return {
+        'PASSKEY': 'ABC123',
+        'dateutc': '2025-12-18 10:30:00',
+        'tempf': '50.0',
+        'humidity': '65',
+        'baromrelin': '29.92',
+        'windspeedmph': '10.0',
+        'winddir': '180',
+        'rainratein': '0.5',
+        'rrain_piezo': '0.1',
+        'uv': '3',
+    }
+
+
+class TestParseEcowittData:
+    """Test Ecowitt field mapping and conversion."""
+
+    def test_metric_conversion(self, ecowitt_form):
+        """Test that imperial values are converted to metric."""
+        data = _parse_ecowitt_data(ecowitt_form, convert_to_metric=True)
+
+        assert data['timestamp'] == '2025-12-18 10:30:00'
+        assert data['temperature'] == pytest.approx(10.0)
+        assert data['humidity'] == 65.0
+        assert data['pressure'] == pytest.approx(29.92 * 33.8639)  # Not rounded
+        assert data['wind_speed'] == pytest.approx(4.4704)
+        assert data['wind_direction'] == 180.0
+        assert data['uv_index'] == 3.0
+
+    def test_imperial_passthrough(self, ecowitt_form):
+        """Test that values are kept as sent when system units are imperial."""
+        data = _parse_ecowitt_data(ecowitt_form, convert_to_metric=False)
+
+        assert data['temperature'] == 50.0
+        assert data['pressure'] == 29.92
+        assert data['wind_speed'] == 10.0
+
+    def test_piezo_rain_overrides_gauge(self, ecowitt_form):
+        """Test that the piezo rain sensor wins over the traditional gauge."""
+        data = _parse_ecowitt_data(ecowitt_form, convert_to_metric=False)
+
+        assert data['rain_rate'] == 0.1
+
+    def test_unknown_and_missing_fields(self, ecowitt_form):
+        """Test that unmapped fields are ignored and missing ones are absent."""
+        data = _parse_ecowitt_data(ecowitt_form, convert_to_metric=True)
+
+        assert 'PASSKEY' not in data
+        assert 'temperature_indoor' not in data
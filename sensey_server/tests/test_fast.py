@@ -0,0 +1,48 @@
+"""
+Unit tests for the chart numeric kernels in fast.py.
+
+The loop kernels are what numba compiles; they are exercised here as plain
+Python so they are checked against the numpy fallback even without numba.
+"""
+
+import numpy as np
+import fast
+
+
+class TestMinMax:
+    """Test NaN-skipping min/max."""
+
+    def test_minmax_skips_nan(self):
+        """Test that NaN values are ignored."""
+        a = np.array([np.nan, 3.0, -1.5, np.nan, 7.25])
+        assert fast.minmax(a) == (-1.5, 7.25)
+        assert fast._minmax_loop(a) == fast._minmax_numpy(a)
+
+    def test_minmax_all_nan(self):
+        """Test that an all-NaN array yields (nan, nan)."""
+        mn, mx = fast.minmax(np.array([np.nan, np.nan]))
+        assert np.isnan(mn) and np.isnan(mx)
+
+
+class TestLTTB:
+    """Test Largest-Triangle-Three-Buckets downsampling."""
+
+    def test_short_series_kept(self):
+        """Test that series no longer than n_out are returned whole."""
+        x = np.arange(10, dtype=float)
+        assert list(fast.lttb_indices(x, x, 10)) == list(range(10))
+
+    def test_loop_matches_numpy(self):
+        """Test that the numba loop kernel selects the same points as numpy."""
+        rng = np.random.default_rng(0)
+        x = np.cumsum(rng.uniform(0.5, 1.5, 5000))
+        y = np.sin(x / 50) + rng.normal(0, 0.1, 5000)
+        y[1234] = 10.0  # Spike
+
+        loop = fast._lttb_loop(x, y, 200)
+        vectorized = fast._lttb_numpy(x, y, 200)
+
+        assert np.array_equal(loop, vectorized)
+        assert len(loop) == 200
+        assert loop[0] == 0 and loop[-1] == 4999
+        assert 1234 in loop  # Peaks survive
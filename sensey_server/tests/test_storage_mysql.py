@@ -0,0 +1,143 @@
+"""
+Unit tests for MySQL storage backend.
+
+Runs without a MySQL server: the connection pool is replaced by a small
+in-memory fake that records the SQL it is sent and answers the handful of
+statements MySQLStorage issues. Tests:
+- Numeric column inference from recent rows
+- Server-side JSON_VALUE projection for the charts route
+"""
+
+import json
+import re
+import warnings
+import pandas as pd
+import pytest
+from datetime import datetime, timedelta
+
+from storage import MySQLStorage
+
+_JSON_VALUE_RE = re.compile(r"JSON_VALUE\(readings, '\$\.(\w+)'[^)]*\) AS `\w+`|(\w+)")
+
+
+class _FakeCursor:
+    """Cursor answering MySQLStorage's SELECTs from a list of row dicts."""
+
+    def __init__(self, db):
+        self.db = db
+        self.column_names = ()
+        self._rows = []
+
+    def execute(self, query, params=()):
+        self.db.queries.append(query)
+        rows = [r for r in self.db.rows if r['client_id'] == params[0]]
+
+        if query.startswith("SELECT COUNT(*)"):
+            self._rows = [(len(rows), max((r['timestamp'] for r in rows), default=None))]
+            return
+
+        select = query[len("SELECT "):query.index(" FROM ")]
+        if "DESC LIMIT" in query:
+            rows = sorted(rows, key=lambda r: r['timestamp'], reverse=True)[:params[1]]
+        elif len(params) > 1:
+            rows = [r for r in rows if r['timestamp'] >= params[1]]
+
+        fields = []
+        for json_key, column in _JSON_VALUE_RE.findall(select):
+            fields.append((json_key or column, bool(json_key)))
+        self.column_names = tuple(name for name, _ in fields)
+        self._rows = [tuple(self._value(r, name, is_json) for name, is_json in fields) for r in rows]
+
+    @staticmethod
+    def _value(row, name, is_json):
+        if name == 'readings':
+            return json.dumps(row['readings']) if row['readings'] else None
+        if is_json:
+            value = (row['readings'] or {}).get(name)
+            return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+        return row[name]
+
+    def fetchone(self):
+        return self._rows[0]
+
+    def fetchall(self):
+        return self._rows
+
+    def close(self):
+        pass
+
+
+class _FakePool:
+    """Connection pool stand-in; every connection shares the same rows and query log."""
+
+    def __init__(self):
+        self.rows = []
+        self.queries = []
+
+    def get_connection(self):
+        return self
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def mysql_storage(mock_mysql_available):
+    """Create a MySQLStorage backed by the in-memory fake pool."""
+    storage = MySQLStorage(database='test_sensey')
+    storage.pool = _FakePool()
+    now = datetime.now()
+    storage.pool.rows = [
+        {
+            'client_id': 'client1',
+            'timestamp': now - timedelta(minutes=10 - i),
+            'temperature': 20.0 + i,
+            'humidity': None,
+            'readings': {'lux': 100 + i, 'status': 'ok', 'door_open': False},
+        }
+        for i in range(10)
+    ]
+    return storage
+
+
+class TestMySQLStorage:
+    """Test MySQL storage queries."""
+
+    def test_numeric_columns_from_recent_rows(self, mysql_storage):
+        """Test that populated fixed columns and numeric JSON keys are reported."""
+        assert mysql_storage.get_numeric_columns('client1') == ['temperature', 'lux']
+
+        query = mysql_storage.pool.queries[-1]
+        assert "ORDER BY timestamp DESC LIMIT" in query
+        assert mysql_storage.get_numeric_columns('nobody') is None
+
+    def test_projection_uses_json_value(self, mysql_storage):
+        """Test that a column projection extracts JSON keys server-side."""
+        with warnings.catch_warnings():
+            # The timestamp conversion must not assign into the projected subset
+            warnings.simplefilter("error", pd.errors.SettingWithCopyWarning)
+            df = mysql_storage.get_latest_data('client1', 'all', columns=['timestamp', 'temperature', 'lux'])
+
+        query = mysql_storage.pool.queries[-1]
+        assert "JSON_VALUE(readings, '$.lux'" in query
+        assert 'readings' not in query.split(" FROM ")[0].replace("JSON_VALUE(readings,", "")
+        assert list(df.columns) == ['timestamp', 'temperature', 'lux']
+        assert list(df['lux']) == [float(100 + i) for i in range(10)]
+        assert pd.api.types.is_datetime64_any_dtype(df['timestamp'])
+
+    def test_charts_route_sends_projected_query(self, flask_test_client, mysql_storage):
+        """Test that the charts page fetches only numeric columns via JSON_VALUE."""
+        import sensey_data
+        sensey_data.set_storage(mysql_storage)
+
+        response = flask_test_client.get('/charts/client1?range=all')
+
+        assert response.status_code == 200
+        assert b'chart-lux' in response.data
+        data_query = next(q for q in mysql_storage.pool.queries if "ORDER BY timestamp ASC" in q)
+        select = data_query.split(" FROM ")[0]
+        assert "JSON_VALUE(readings, '$.lux'" in select
+        assert 'readings' not in select.replace("JSON_VALUE(readings,", "")
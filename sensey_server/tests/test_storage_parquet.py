@@ -0,0 +1,226 @@
+"""
+Unit tests for Parquet storage backend.
+
+Skipped when pyarrow is not installed. Tests the ParquetStorage class
+functionality including:
+- Data storage and batching
+- Typed timestamps and sort order
+- Column projection
+- Time range filtering and row group pruning
+- Append-only part files and compaction
+"""
+
+import pytest
+import os
+import pandas as pd
+from datetime import datetime, timedelta
+
+pytest.importorskip("pyarrow")
+
+from storage import BatchStoreError, ParquetStorage, create_storage
+
+
+@pytest.fixture
+def parquet_storage(temp_dir):
+    """Create an initialized Parquet storage backend."""
+    storage = ParquetStorage(data_dir=temp_dir)
+    storage.initialize()
+    yield storage
+    storage.close()
+
+
+class TestParquetStorage:
+    """Test Parquet storage reads and writes."""
+
+    def test_factory_creates_parquet_storage(self, temp_dir):
+        """Test that create_storage('parquet') returns a ParquetStorage."""
+        assert isinstance(create_storage("parquet", data_dir=temp_dir), ParquetStorage)
+
+    def test_store_and_read(self, parquet_storage, sample_sensor_data_batch):
+        """Test that stored readings come back typed and sorted by timestamp."""
+        parquet_storage.store_batch(('client1', d) for d in sample_sensor_data_batch)
+
+        df = parquet_storage.get_latest_data('client1', 'all')
+
+        assert len(df) == len(sample_sensor_data_batch)
+        assert pd.api.types.is_datetime64_any_dtype(df['timestamp'])
+        assert df['timestamp'].is_monotonic_increasing
+        assert parquet_storage.get_available_clients() == ['client1']
+
+    def test_appends_across_writes(self, parquet_storage, sample_sensor_data):
+        """Test that each write keeps the rows already in the file."""
+        parquet_storage.store_data('client1', sample_sensor_data)
+        version = parquet_storage.get_data_version('client1')
+
+        later = dict(sample_sensor_data, timestamp=(datetime.now() + timedelta(seconds=1)).isoformat())
+        parquet_storage.store_data('client1', later)
+
+        assert parquet_storage.get_data_version('client1') != version
+        assert len(parquet_storage.get_latest_data('client1', 'all')) == 2
+
+    def test_writes_add_parts_without_rewriting(self, parquet_storage, sample_sensor_data):
+        """Test that later writes go to part files and leave the main file alone."""
+        parquet_storage.store_data('client1', sample_sensor_data)
+        file_path = os.path.join(parquet_storage.data_dir, 'client1.parquet')
+        main_version = os.stat(file_path).st_mtime_ns
+
+        for i in range(3):
+            later = dict(sample_sensor_data, timestamp=(datetime.now() + timedelta(seconds=i + 1)).isoformat())
+            parquet_storage.store_data('client1', later)
+
+        assert os.stat(file_path).st_mtime_ns == main_version
+        assert len(os.listdir(os.path.join(parquet_storage.data_dir, 'client1.parts'))) == 3
+        assert parquet_storage.get_available_clients() == ['client1']
+        assert len(parquet_storage.get_latest_data('client1', 'all')) == 4
+
+    def test_compaction_merges_parts(self, parquet_storage, monkeypatch):
+        """Test that parts are merged into the main file once COMPACT_PARTS exist."""
+        monkeypatch.setattr(ParquetStorage, 'COMPACT_PARTS', 3)
+        now = datetime.now()
+        # Out of order on purpose: the merged file must still come out sorted
+        for i in [0, 3, 1, 2]:
+            parquet_storage.store_data('client1', {'timestamp': (now + timedelta(seconds=i)).isoformat(),
+                                                   'temperature': float(i), 'lux': i})
+
+        part_dir = os.path.join(parquet_storage.data_dir, 'client1.parts')
+        assert os.listdir(part_dir) == []
+
+        df = pd.read_parquet(os.path.join(parquet_storage.data_dir, 'client1.parquet'))
+        assert list(df['temperature']) == [0.0, 1.0, 2.0, 3.0]
+        assert list(parquet_storage.get_latest_data('client1', 'all')['temperature']) == [0.0, 1.0, 2.0, 3.0]
+
+    def test_interrupted_compaction_keeps_rows_once(self, parquet_storage, monkeypatch):
+        """Test that parts already merged but not yet deleted aren't read twice."""
+        monkeypatch.setattr(ParquetStorage, 'COMPACT_PARTS', 2)
+        monkeypatch.setattr(ParquetStorage, '_remove_parts', staticmethod(lambda part_dir, names: None))
+        now = datetime.now()
+        for i in range(3):
+            parquet_storage.store_data('client1', {'timestamp': (now + timedelta(seconds=i)).isoformat(),
+                                                   'temperature': float(i)})
+
+        # The merged parts are still on disk, but the main file says it holds their rows
+        assert len(os.listdir(os.path.join(parquet_storage.data_dir, 'client1.parts'))) == 2
+        assert list(parquet_storage.get_latest_data('client1', 'all')['temperature']) == [0.0, 1.0, 2.0]
+
+        # The next compaction clears the leftovers without merging them again
+        monkeypatch.undo()
+        monkeypatch.setattr(ParquetStorage, 'COMPACT_PARTS', 2)
+        for i in range(3, 5):
+            parquet_storage.store_data('client1', {'timestamp': (now + timedelta(seconds=i)).isoformat(),
+                                                   'temperature': float(i)})
+
+        assert os.listdir(os.path.join(parquet_storage.data_dir, 'client1.parts')) == []
+        assert list(parquet_storage.get_latest_data('client1', 'all')['temperature']) == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+    def test_failed_compaction_keeps_rows_once(self, parquet_storage, monkeypatch):
+        """Test that a failing compaction doesn't fail the write or duplicate rows."""
+        monkeypatch.setattr(ParquetStorage, 'COMPACT_PARTS', 2)
+
+        def broken_compact(self, client_id):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(ParquetStorage, '_compact', broken_compact)
+        now = datetime.now()
+        for i in range(3):
+            # A batch that raised here would be requeued and written again
+            parquet_storage.store_batch([('client1', {'timestamp': (now + timedelta(seconds=i)).isoformat(),
+                                                      'temperature': float(i)})])
+
+        part_dir = os.path.join(parquet_storage.data_dir, 'client1.parts')
+        assert len(os.listdir(part_dir)) == 2
+        assert list(parquet_storage.get_latest_data('client1', 'all')['temperature']) == [0.0, 1.0, 2.0]
+
+        # Once compaction works again, the next flush merges the parts left behind
+        monkeypatch.undo()
+        monkeypatch.setattr(ParquetStorage, 'COMPACT_PARTS', 2)
+        parquet_storage.store_data('client1', {'timestamp': (now + timedelta(seconds=3)).isoformat(),
+                                               'temperature': 3.0})
+
+        assert os.listdir(part_dir) == []
+        assert list(parquet_storage.get_latest_data('client1', 'all')['temperature']) == [0.0, 1.0, 2.0, 3.0]
+
+    def test_compaction_tolerates_type_changes(self, parquet_storage, monkeypatch):
+        """Test that a field switching from numbers to text between parts still compacts."""
+        monkeypatch.setattr(ParquetStorage, 'COMPACT_PARTS', 2)
+        now = datetime.now()
+        for i, lux in enumerate([1.0, 2.0, 'err']):
+            parquet_storage.store_data('client1', {'timestamp': (now + timedelta(seconds=i)).isoformat(),
+                                                   'lux': lux})
+
+        assert os.listdir(os.path.join(parquet_storage.data_dir, 'client1.parts')) == []
+        df = parquet_storage.get_latest_data('client1', 'all')
+        assert list(df['lux']) == ['1.0', '2.0', 'err']
+
+    def test_batch_failure_reports_only_failed_client(self, parquet_storage, sample_sensor_data):
+        """Test that one client's bad reading doesn't stop the rest of the batch."""
+        with pytest.raises(BatchStoreError) as exc_info:
+            parquet_storage.store_batch([
+                ('a', dict(sample_sensor_data, timestamp='not a time')),
+                ('b', sample_sensor_data),
+            ])
+
+        assert exc_info.value.failed_clients == {'a'}
+        assert parquet_storage.get_available_clients() == ['b']
+        assert len(parquet_storage.get_latest_data('b', 'all')) == 1
+
+    def test_nested_readings_flattened(self, parquet_storage, sample_nested_sensor_data):
+        """Test that nested readings are stored as columns."""
+        parquet_storage.store_data('client1', sample_nested_sensor_data)
+
+        df = parquet_storage.get_latest_data('client1', 'all')
+
+        assert 'readings' not in df.columns
+        assert df['temperature'].iloc[0] == 23.5
+
+    def test_column_projection(self, parquet_storage, sample_sensor_data):
+        """Test numeric column listing and reading a subset of columns."""
+        parquet_storage.store_data('client1', dict(sample_sensor_data, status='ok'))
+
+        numeric = parquet_storage.get_numeric_columns('client1')
+        assert set(numeric) == {'temperature', 'humidity', 'lux', 'soil_moisture'}
+
+        df = parquet_storage.get_latest_data('client1', 'all', columns=['timestamp', 'lux', 'missing'])
+        assert list(df.columns) == ['timestamp', 'lux']
+
+    def test_time_range_filtering(self, parquet_storage):
+        """Test that old readings are filtered out by time range."""
+        now = datetime.now()
+        parquet_storage.store_batch([
+            ('client1', {'timestamp': (now - timedelta(days=2)).isoformat(), 'temperature': 1.0}),
+            ('client1', {'timestamp': now.isoformat(), 'temperature': 2.0}),
+        ])
+
+        df = parquet_storage.get_latest_data('client1', '1d')
+
+        assert list(df['temperature']) == [2.0]
+
+    def test_time_range_skips_old_row_groups(self, parquet_storage, monkeypatch):
+        """Test that narrow ranges only read the row groups that can match."""
+        import pyarrow.parquet as pq
+
+        monkeypatch.setattr(ParquetStorage, 'ROW_GROUP_SIZE', 10)
+        now = datetime.now()
+        parquet_storage.store_batch(
+            ('client1', {'timestamp': (now - timedelta(hours=100 - i)).isoformat(), 'temperature': float(i)})
+            for i in range(100)
+        )
+        file_path = os.path.join(parquet_storage.data_dir, 'client1.parquet')
+        assert pq.ParquetFile(file_path).num_row_groups == 10
+
+        version = parquet_storage.get_data_version('client1')[0]
+        cutoff = parquet_storage.parse_time_range('6h')
+        assert parquet_storage._first_row_group(file_path, version, cutoff) == 9
+
+        df = parquet_storage.get_latest_data('client1', '6h')
+        assert list(df['temperature']) == [95.0, 96.0, 97.0, 98.0, 99.0]
+        assert len(parquet_storage.get_latest_data('client1', 'all')) == 100
+
+        # Nothing in range: the last group is still read, for an empty frame with columns
+        assert parquet_storage._first_row_group(file_path, version, now + timedelta(days=1)) == 9
+
+    def test_nonexistent_client(self, parquet_storage):
+        """Test reads for a client without data."""
+        assert parquet_storage.get_latest_data('nobody') is None
+        assert parquet_storage.get_data_version('nobody') is None
+        assert parquet_storage.get_numeric_columns('nobody') is None
+        assert not os.path.exists(os.path.join(parquet_storage.data_dir, 'nobody.parquet'))
@@ -0,0 +1,26 @@
+"""
+WSGI entry point for running the Sensey Server under gunicorn.
+
+    gunicorn wsgi:application
+
+gevent's monkey patching must happen before Flask, requests or the storage
+drivers are imported, so that socket and file I/O yield to other green
+threads instead of blocking the worker. The gunicorn gevent worker also
+patches on startup; doing it here keeps the entry point correct under any
+gevent-based server.
+
+Storage is initialized when app is imported. Gunicorn imports this module in
+each worker after forking (preload_app is off in gunicorn.conf.py), so every
+worker opens its own storage backend and connection pool.
+"""
+
+try:
+    from gevent import monkey
+    monkey.patch_all()
+except ImportError:
+    # Plain sync/threaded server: nothing to patch
+    pass
+
+from app import app
+
+application = app